@@ -0,0 +1,191 @@
+"""
+Module containing sound loading with a silent fallback, and the voice pool sounds are played through.
+When audio is disabled, or there is no audio device, sounds load as SilentSound objects
+and the voice pool plays through a NullBackend.
+"""
+
+import pygame
+from time import perf_counter
+
+ENABLED = True
+
+class SilentSound:
+    """Stands in for pygame.mixer.Sound when there is no audio"""
+    def play(self, *args, **kwargs):
+        return None
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+    def get_volume(self):
+        return 0
+
+
+def disable():
+    """Turn audio off, every sound loaded or played afterwards is silent"""
+    global ENABLED
+    ENABLED = False
+    AUDIO._backend = NullBackend(AUDIO.size)
+
+
+def available():
+    """Returns whether sounds can be played, initializing the mixer on first use"""
+    global ENABLED
+    if not ENABLED:
+        return False
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            ENABLED = False
+    return ENABLED
+
+
+def load_sound(path: str, volume: float=None):
+    """
+    Load a sound file.
+    Arguments:
+        path: path of the sound file
+        volume: volume between 0 and 1, left at pygame's default if None
+    Returns:
+        pygame.mixer.Sound object, or a SilentSound if audio is unavailable
+    """
+    if not available():
+        return SilentSound()
+    sound = pygame.mixer.Sound(path)
+    if volume is not None:
+        sound.set_volume(volume)
+    return sound
+
+
+# Category -> (reserved voices, priority). A sound can steal a voice from one of the same or a lower priority.
+CATEGORIES = {
+    "player": (1, 4),
+    "ui": (1, 3),
+    "impacts": (3, 2),
+    "weapons": (2, 1),
+}
+SHARED_VOICES = 2  # Voices any category can use once its own are busy
+COALESCE_WINDOW = 0.03  # Seconds, about two frames
+
+class NullBackend:
+    """Voice backend that plays nothing, for headless runs and when there is no audio device"""
+    def __init__(self, voices: int):
+        self.voices = voices
+
+    def play(self, voice: int, sound):
+        pass
+
+    def stop(self, voice: int):
+        pass
+
+    def busy(self, voice: int):
+        return False
+
+
+class MixerBackend:
+    """Voice backend on pygame.mixer, one channel per voice"""
+    def __init__(self, voices: int):
+        pygame.mixer.set_num_channels(voices)
+        pygame.mixer.set_reserved(voices)  # Sound.play() can not take one of the pool's channels
+        self.channels = [pygame.mixer.Channel(i) for i in range(voices)]
+
+    def play(self, voice: int, sound):
+        # A channel needs the pygame Sound itself, so a DeferredSound is loaded here
+        self.channels[voice].play(getattr(sound, "sound", sound))
+
+    def stop(self, voice: int):
+        self.channels[voice].stop()
+
+    def busy(self, voice: int):
+        return self.channels[voice].get_busy()
+
+
+class AudioSystem:
+    def __init__(self, categories: dict=CATEGORIES, shared: int=SHARED_VOICES, window: float=COALESCE_WINDOW, backend=None):
+        """
+        Creates an AudioSystem, a fixed pool of voices split between sound categories.
+        Arguments:
+            categories: dict of category -> (reserved voices, priority)
+            shared: voices any category can use once its own are busy
+            window: seconds within which plays of the same sound are merged into the first one
+            backend: MixerBackend or NullBackend, picked on the first play if None
+        """
+        self.categories = categories
+        self.window = window
+
+        self.pools = {}  # Category -> indices of its reserved voices
+        start = 0
+        for category, (voices, priority) in categories.items():
+            self.pools[category] = list(range(start, start + voices))
+            start += voices
+        self.shared = list(range(start, start + shared))
+        self.size = start + shared
+
+        self.voices = [None]*self.size  # (priority, start time) of the sound each voice last played
+        self.last = {}  # Sound -> time it last started
+        self.stats = {"played": 0, "coalesced": 0, "stolen": 0, "dropped": 0}
+        self._backend = backend
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = MixerBackend(self.size) if available() else NullBackend(self.size)
+        return self._backend
+
+    def play(self, sound, category: str, now: float=None):
+        """
+        Play a sound on a voice of its category.
+        Arguments:
+            sound: pygame.mixer.Sound, DeferredSound or SilentSound object
+            category: key of categories
+            now: time of the play in seconds, perf_counter() if None
+        Returns:
+            index of the voice, or None if the play was merged into an earlier one or no voice was free
+        """
+        if now is None:
+            now = perf_counter()
+        last = self.last.get(sound)
+        if last is not None and now - last < self.window:
+            self.stats["coalesced"] += 1
+            return None
+
+        voice = self.find_voice(category)
+        if voice is None:
+            self.stats["dropped"] += 1
+            return None
+        self.last[sound] = now
+        self.voices[voice] = (self.categories[category][1], now)
+        self.backend.play(voice, sound)
+        self.stats["played"] += 1
+        return voice
+
+    def find_voice(self, category: str):
+        """
+        Returns a free voice reserved for the category, else a free shared one, else the
+        busy voice with the lowest priority that has played longest, if its priority is
+        not above the category's. Returns None if every usable voice plays something more important.
+        """
+        backend = self.backend
+        candidates = self.pools[category] + self.shared
+        for voice in candidates:
+            if not backend.busy(voice):
+                return voice
+
+        voice = min(candidates, key=lambda voice: self.voices[voice])
+        if self.voices[voice][0] > self.categories[category][1]:
+            return None
+        backend.stop(voice)
+        self.stats["stolen"] += 1
+        return voice
+
+    def stop(self):
+        """Stop every voice"""
+        for voice in range(self.size):
+            self.backend.stop(voice)
+
+
+AUDIO = AudioSystem()
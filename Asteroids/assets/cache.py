@@ -0,0 +1,102 @@
+"""
+Module containing a cache of pre-rasterized outline sprites.
+Each shape is drawn once onto its own surface so that drawing it again is a single blit.
+"""
+
+import pygame
+import numpy as np
+from collections import OrderedDict
+
+from assets.shapes import rotation_matrix
+
+class SpriteCache:
+    def __init__(self, capacity: int=128, rotation_buckets: int=64, color=(255, 255, 255), width: int=2):
+        """
+        Creates a SpriteCache with least recently used eviction.
+        Arguments:
+            capacity: largest number of sprites kept at once
+            rotation_buckets: number of angles a full turn is rounded to
+            color: outline color
+            width: outline width, as in pygame.draw.polygon
+        """
+        self.capacity = capacity
+        self.rotation_buckets = rotation_buckets
+        self.color = color
+        self.width = width
+
+        self.sprites = OrderedDict()  # (key, bucket) -> (surface, offset)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bucket(self, angle: float):
+        """Returns the rotation bucket an angle in degrees falls into"""
+        return round(angle*self.rotation_buckets/360) % self.rotation_buckets
+
+    def get(self, key, outline, angle: float=0):
+        """
+        Returns the sprite of an outline, rasterizing it on the first request.
+        Arguments:
+            key: hashable id of the outline, such as (template, scale)
+            outline: array of shape (n, 2) of vertices relative to the shape's center
+            angle: rotation in degrees, rounded to the nearest bucket
+        Returns:
+            (surface, offset) where offset is added to the shape's center to get the blit position
+        """
+        bucket = self.bucket(angle) if angle else 0
+        sprite = self.sprites.get((key, bucket))
+        if sprite is not None:
+            self.hits += 1
+            self.sprites.move_to_end((key, bucket))
+            return sprite
+
+        self.misses += 1
+        sprite = self.rasterize(outline, bucket*360/self.rotation_buckets)
+        self.sprites[(key, bucket)] = sprite
+        if len(self.sprites) > self.capacity:
+            self.sprites.popitem(last=False)
+            self.evictions += 1
+        return sprite
+
+    def rasterize(self, outline, angle: float=0):
+        """Draw an outline onto a new transparent surface"""
+        outline = np.asarray(outline, dtype=float)
+        if angle:
+            outline = outline @ rotation_matrix(angle).T
+
+        offset = np.floor(outline.min(axis=0)) - self.width
+        size = np.ceil(outline.max(axis=0) - offset) + self.width + 1
+        surface = pygame.Surface((int(size[0]), int(size[1])))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill((0, 0, 0))
+        pygame.draw.polygon(surface, self.color, outline - offset, self.width)
+        surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+        return surface, (float(offset[0]), float(offset[1]))
+
+    def draw(self, surface: pygame.Surface, sprites: list):
+        """
+        Blit a batch of cached sprites.
+        Arguments:
+            surface: pygame.Surface object
+            sprites: list of (key, outline, center, angle)
+        Returns:
+            list of the pygame.Rect objects drawn to
+        """
+        blits = []
+        for key, outline, center, angle in sprites:
+            sprite, offset = self.get(key, outline, angle)
+            blits.append((sprite, (center[0]+offset[0], center[1]+offset[1])))
+        return surface.blits(blits)
+
+    def clear(self):
+        self.sprites.clear()
+
+    def stats(self):
+        return {"sprites": len(self.sprites), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+# Shared by the menu and the game, so each asteroid outline is only rasterized once.
+# Sized for every spinning asteroid outline (3 shapes, 3 sizes, 64 angles) plus the menu's.
+SPRITES = SpriteCache(capacity=1024)
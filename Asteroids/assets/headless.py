@@ -0,0 +1,97 @@
+"""
+Headless runner: plays the game simulation with no window, rendering or audio, as fast as possible.
+Run from the Asteroids directory with:
+    python -m assets.headless --ticks 100000
+"""
+
+import argparse
+import random
+from time import perf_counter
+
+from pygame.locals import K_LEFT, K_RIGHT
+
+from assets import audio
+from assets.simulation import Simulation
+from assets.replay import InputLog
+
+def autopilot(seed: int=None):
+    """
+    Endless input stream that holds random keys for random stretches of time.
+    Yields:
+        (move, fire, left, right) for each tick
+    """
+    rng = random.Random(seed)
+    move = fire = left = right = False
+    while True:
+        hold = rng.randint(5, 40)
+        move = rng.random() < 0.4
+        turn = rng.random()
+        left, right = turn < 0.3, turn > 0.7
+        for i in range(hold):
+            fire = rng.random() < 0.3
+            yield move, fire, left, right
+
+
+def run(ticks: int, inputs, seed: int=None, width: int=650, height: int=650, log: InputLog=None):
+    """
+    Run the simulation for a number of ticks, starting a new game whenever one ends.
+    Arguments:
+        ticks: number of ticks to simulate
+        inputs: iterable of (move, fire, left, right), one per tick
+        seed: seed of the simulation
+        width, height: size of the playing field
+        log: InputLog to record the inputs to, its seed is set to the simulation's
+    Returns:
+        dict of the run's results
+    """
+    audio.disable()
+    simulation = Simulation(width, height, seed)
+    if log is not None:
+        log.seed = simulation.seed
+    scores = []
+    inputs = iter(inputs)
+    reset = False
+
+    start = perf_counter()
+    for tick in range(ticks):
+        move, fire, left, right = next(inputs)
+        if reset:
+            simulation.reset()
+        simulation.tick(move, fire, {K_LEFT: left, K_RIGHT: right})
+        if log is not None:
+            log.record(move, fire, left, right, reset)
+        reset = simulation.finished
+        if reset:
+            scores.append(simulation.score)
+    elapsed = perf_counter() - start
+
+    if not reset:
+        scores.append(simulation.score)
+    return {
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_second": ticks/elapsed if elapsed else float("inf"),
+        "seed": simulation.seed,
+        "games": len(scores),
+        "scores": scores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Asteroids simulation without a display.")
+    parser.add_argument("--ticks", type=int, default=36000, help="number of ticks to simulate (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the game and the autopilot")
+    parser.add_argument("--record", metavar="PATH", default=None, help="save the inputs as a replayable log")
+    args = parser.parse_args()
+
+    log = InputLog(args.seed) if args.record else None
+    result = run(args.ticks, autopilot(args.seed), args.seed, log=log)
+    if log is not None:
+        log.save(args.record)
+    print(f"{result['ticks']} ticks in {result['seconds']:.2f}s: {result['ticks_per_second']:.0f} ticks/s, "
+          f"{result['ticks_per_second']/60:.1f}x real time")
+    print(f"seed {result['seed']}, {result['games']} games, scores: {result['scores']}")
+
+
+if __name__ == '__main__':
+    main()
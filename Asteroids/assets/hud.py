@@ -0,0 +1,124 @@
+"""
+Module containing the heads-up display.
+Text is composed from pre-rendered glyphs and the HUD is kept on a cached layer,
+so no font rendering happens while playing.
+"""
+
+import pygame
+
+class GlyphAtlas:
+    def __init__(self, font: pygame.font.Font, characters: str="0123456789", color=(255, 255, 255)):
+        """
+        Creates a GlyphAtlas, one pre-rendered surface per character.
+        Arguments:
+            font: pygame.font.Font object
+            characters: every character that will be drawn
+            color: text color
+        """
+        self.font = font
+        self.color = color
+        self.glyphs = {}
+        self.last_text, self.last_offsets = "", []
+        self.height = font.get_height()
+        self.add(characters)
+
+    def add(self, characters: str):
+        """Render any characters that are not in the atlas yet"""
+        for character in characters:
+            if character not in self.glyphs:
+                self.glyphs[character] = self.font.render(character, True, self.color)
+
+    def offsets(self, text: str):
+        """
+        Returns the x of each glyph of a string, where pygame.font.Font.render would put it.
+        The font is only measured, not rendered, so kerning and its rounding match font.render,
+        and the offsets of the last string are kept since size() and blit() are used in pairs.
+        """
+        if text != self.last_text:
+            self.add(text)
+            self.last_offsets = [self.font.size(text[:i+1])[0] - self.glyphs[character].get_width() for i, character in enumerate(text)]
+            self.last_text = text
+        return self.last_offsets
+
+    def size(self, text: str):
+        """Returns the (width, height) of a string drawn with the atlas, the same as pygame.font.Font.size"""
+        if not text:
+            return 0, self.height
+        return self.offsets(text)[-1] + self.glyphs[text[-1]].get_width(), self.height
+
+    def blit(self, surface: pygame.Surface, text: str, position: tuple):
+        """
+        Draw a string glyph by glyph.
+        Returns:
+            pygame.Rect object of the drawn text
+        """
+        x, y = position
+        for character, offset in zip(text, self.offsets(text)):
+            surface.blit(self.glyphs[character], (x + offset, y))
+        return pygame.Rect(x, y, self.size(text)[0], self.height)
+
+    def render(self, text: str):
+        """Returns a new surface with the string on it, like pygame.font.Font.render"""
+        surface = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        self.blit(surface, text, (0, 0))
+        return surface
+
+
+ATLASES = {}
+
+def get_atlas(font: pygame.font.Font, characters: str="0123456789", color=(255, 255, 255)):
+    """Returns the shared GlyphAtlas of a font and color, creating it on first use"""
+    key = (id(font), color)
+    if key not in ATLASES:
+        ATLASES[key] = GlyphAtlas(font, characters, color)
+    ATLASES[key].add(characters)
+    return ATLASES[key]
+
+
+class HUD:
+    def __init__(self, atlas: GlyphAtlas, health_image: pygame.Surface):
+        """
+        Creates the gameplay HUD showing the score and the remaining health.
+        Arguments:
+            atlas: GlyphAtlas used for the score
+            health_image: icon drawn once per life
+        """
+        self.atlas = atlas
+        self.HEALTH_IMG = health_image
+
+        self.score = None
+        self.health = None
+        self.layer = None
+        self.position = (0, 0)
+        self.rebuilds = 0
+
+    def update(self, score: int, health: int):
+        """Rebuild the cached layer if the score or health changed"""
+        if score == self.score and health == self.health:
+            return
+        self.score, self.health = score, health
+        self.rebuilds += 1
+
+        text = str(score)
+        width, height = self.atlas.size(text)
+        items = [(text, pygame.Rect(78-(width//2), 10, width, height))]
+        for i in range(health):
+            items.append((self.HEALTH_IMG, self.HEALTH_IMG.get_rect(topleft=(30 + 35*(i), 50))))
+
+        bounds = items[0][1].unionall([rect for item, rect in items])
+        self.layer = pygame.Surface(bounds.size, pygame.SRCALPHA)
+        self.position = bounds.topleft
+        for item, rect in items:
+            position = (rect.x-bounds.x, rect.y-bounds.y)
+            if isinstance(item, str):
+                self.atlas.blit(self.layer, item, position)
+            else:
+                self.layer.blit(item, position)
+
+    def draw(self, surface: pygame.Surface):
+        """
+        Blit the cached layer.
+        Returns:
+            pygame.Rect object drawn to
+        """
+        return surface.blit(self.layer, self.position)
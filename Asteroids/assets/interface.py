@@ -1,9 +1,11 @@
 import pygame
 
-pygame.font.init()
+from assets.loader import ASSETS
 
 class Label:
-    def __init__(self, font=pygame.font.SysFont("comicsansms", 15), text="", position: tuple=(0, 0), color=(0, 0, 0)):
+    def __init__(self, font=None, text="", position: tuple=(0, 0), color=(0, 0, 0)):
+        if font is None:
+            font = ASSETS.system_font("comicsansms", 15)  # Looked up on first use, the scan of system fonts is slow
         self.text = font.render(text, True, color)
         self.position = position
     def draw(self, surface: pygame.Surface):
@@ -0,0 +1,199 @@
+"""
+Module containing the asset manager.
+Every image, sound and font is loaded once and cached by path. Images and sounds
+can be preloaded on a background thread, e.g. while the menu is showing, and images
+are converted to the display's pixel format on the main thread when first asked for.
+Nothing is loaded at import: fonts, the mixer and sounds are set up on first use.
+"""
+
+import pygame
+import threading
+
+from assets import audio
+
+FONT = "assets/fonts/rexlia rg.otf"
+
+# Everything the game loads, as (path, colorkey) for images and (path, volume) for sounds
+IMAGES = [
+    ("assets/images/mouse.png", (0, 0, 0)),
+    ("assets/images/health bar.png", (0, 0, 0)),
+]
+SOUNDS = [
+    ("assets/sounds/click.wav", 0.25),
+    ("assets/sounds/fire.wav", 0.25),
+    ("assets/sounds/dead.wav", 0.25),
+    ("assets/sounds/asteroid hit.wav", 0.1),
+    ("assets/sounds/game over.wav", None),
+]
+
+class AssetManager:
+    def __init__(self):
+        """Creates an empty AssetManager"""
+        self.images = {}  # Path -> surface as loaded
+        self.converted = {}  # Path -> surface in the display's pixel format
+        self.sounds = {}  # Path -> pygame.mixer.Sound or SilentSound
+        self.deferred = {}  # Path -> DeferredSound handed out for it
+        self.fonts = {}  # (path, size) or ("system", name, size) -> pygame.font.Font
+
+        self.lock = threading.Lock()
+        self.loading = {}  # (table id, key) -> threading.Event set once the load is over
+        self.thread = None
+
+    def fetch(self, table: dict, key, load):
+        """
+        Returns table[key], calling load() to fill it in if it is missing.
+        If another thread is already loading the key, this waits for it instead of loading twice.
+        """
+        while True:
+            with self.lock:
+                if key in table:
+                    return table[key]
+                event = self.loading.get((id(table), key))
+                if event is None:
+                    event = self.loading[(id(table), key)] = threading.Event()
+                    break
+            event.wait()  # If that load failed the key is still missing, and this thread tries
+
+        try:
+            value = load()
+            with self.lock:
+                table[key] = value
+        finally:
+            with self.lock:
+                del self.loading[(id(table), key)]
+            event.set()
+        return value
+
+    def image(self, path: str, colorkey=None):
+        """
+        Load an image.
+        Arguments:
+            path: path of the image file
+            colorkey: color drawn as transparent, applied on the first load
+        Returns:
+            pygame.Surface object, converted to the display's pixel format once a display exists
+        """
+        def load():
+            surface = pygame.image.load(path)
+            if colorkey is not None:
+                surface.set_colorkey(colorkey)
+            return surface
+
+        surface = self.fetch(self.images, path, load)
+        if path in self.converted:
+            return self.converted[path]
+        # Conversion needs the display, which only the main thread may use
+        if pygame.display.get_surface() is None or threading.current_thread() is not threading.main_thread():
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            converted = surface.convert_alpha()
+        else:
+            converted = surface.convert()
+        self.converted[path] = converted
+        return converted
+
+    def sound(self, path: str, volume: float=None):
+        """
+        Get a sound, without loading it yet.
+        Arguments:
+            path: path of the sound file
+            volume: volume between 0 and 1, applied on the first load
+        Returns:
+            DeferredSound that loads the sound when first played, the same object for every call with a path
+        """
+        with self.lock:
+            if path not in self.deferred:
+                self.deferred[path] = DeferredSound(self, path, volume)
+            return self.deferred[path]
+
+    def load_sound(self, path: str, volume: float=None):
+        """
+        Load a sound now.
+        Returns:
+            pygame.mixer.Sound object, or a SilentSound if audio is unavailable
+        """
+        return self.fetch(self.sounds, path, lambda: audio.load_sound(path, volume))
+
+    def font(self, path: str, size: int):
+        """
+        Load a font.
+        Arguments:
+            path: path of the font file, pygame's default font if None
+            size: height in pixels
+        Returns:
+            pygame.font.Font object
+        """
+        font_init()
+        return self.fetch(self.fonts, (path, size), lambda: pygame.font.Font(path, size))
+
+    def system_font(self, name: str, size: int):
+        """
+        Load an installed font by name. The first call scans the system's fonts, which can be slow.
+        Returns:
+            pygame.font.Font object
+        """
+        font_init()
+        return self.fetch(self.fonts, ("system", name, size), lambda: pygame.font.SysFont(name, size))
+
+    def preload(self, images: list=IMAGES, sounds: list=SOUNDS):
+        """
+        Start loading images and sounds on a background thread. Asking for an asset that is
+        still loading waits for it, and one that has not been reached yet is loaded at once.
+        Fonts are left to the main thread, since the font renderer is not thread safe.
+        Arguments:
+            images: list of (path, colorkey)
+            sounds: list of (path, volume)
+        """
+        if self.thread is not None:
+            return self.thread
+        audio.available()  # The mixer is set up here, not on the loading thread
+
+        def run():
+            for path, colorkey in images:
+                self.image(path, colorkey)
+            for path, volume in sounds:
+                self.load_sound(path, volume)
+
+        self.thread = threading.Thread(target=run, name="asset preload", daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def wait(self):
+        """Block until the preload thread, if any, is finished"""
+        if self.thread is not None:
+            self.thread.join()
+
+
+class DeferredSound:
+    """Stands in for a sound that has not been loaded, so the mixer is only set up once a sound plays"""
+    def __init__(self, manager: AssetManager, path: str, volume: float=None):
+        self.manager = manager
+        self.path, self.volume = path, volume
+        self._sound = None
+
+    @property
+    def sound(self):
+        if self._sound is None:
+            self._sound = self.manager.load_sound(self.path, self.volume)
+        return self._sound
+
+    def play(self, *args, **kwargs):
+        return self.sound.play(*args, **kwargs)
+
+    def stop(self):
+        self.sound.stop()
+
+    def set_volume(self, volume):
+        self.sound.set_volume(volume)
+
+    def get_volume(self):
+        return self.sound.get_volume()
+
+
+def font_init():
+    """Initialize pygame's font module on first use, instead of at import"""
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+ASSETS = AssetManager()
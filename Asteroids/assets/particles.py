@@ -0,0 +1,119 @@
+"""
+Module containing the particle system used for explosions in the menu and the game.
+All particle state lives in preallocated NumPy arrays.
+"""
+
+import pygame
+import numpy as np
+import random
+
+# Pixels covered by pygame.draw.circle with a radius of 2, relative to the truncated center
+DOT = np.array([[-2, -1], [-2, 0], [-1, -2], [-1, -1], [-1, 0], [-1, 1], [0, -2], [0, -1], [0, 0], [0, 1], [1, -1], [1, 0]])
+
+class Particles:
+    def __init__(self, capacity: int=2048, decay: float=1, speed: float=1.5, lifetime: tuple=(45, 60), color=(255, 255, 255), rng=None):
+        """
+        Creates a fixed capacity particle pool.
+        Live particles are kept packed at the front of the arrays. Expired particles
+        are swap-removed, and once the pool is full the oldest slots are overwritten
+        in ring order.
+        Arguments:
+            capacity: hard cap on the number of live particles
+            decay: amount taken off each particle's timer every update
+            speed: largest horizontal or vertical speed of a particle
+            lifetime: range of starting timer values, (min, max)
+            color: color of the particles
+            rng: random.Random stream, the random module is used if None
+        """
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))  # Positions before the last update
+        self.velocities = np.zeros((capacity, 2))
+        self.timers = np.zeros(capacity)
+        self.count = 0
+        self.cursor = 0  # Next slot to overwrite when the pool is full
+
+        self.DECAY = decay
+        self.SPEED = speed
+        self.LIFETIME = lifetime
+        self.color = color
+        self.rng = rng or random
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, coord, number: int):
+        """
+        Add a burst of particles moving away from a point.
+        Arguments:
+            coord: starting position, (x, y)
+            number: number of particles
+        """
+        number = min(number, self.capacity)
+        free = self.capacity - self.count
+        slots = list(range(self.count, self.count + min(number, free)))
+        for i in range(number - len(slots)):
+            slots.append(self.cursor)
+            self.cursor = (self.cursor + 1) % self.capacity
+        self.count += min(number, free)
+
+        # Each speed is between 0.1 and SPEED in either direction, so no particle stands still
+        self.positions[slots] = coord
+        self.previous[slots] = coord
+        self.velocities[slots] = [[self.rng.uniform(0.1, self.SPEED)*self.rng.choice((-1, 1)) for j in range(2)] for i in slots]
+        self.timers[slots] = [self.rng.randint(*self.LIFETIME) for i in slots]
+
+    def update(self):
+        """Move every particle, age it and remove the expired ones"""
+        count = self.count
+        if not count:
+            return
+        self.previous[:count] = self.positions[:count]
+        self.positions[:count] += self.velocities[:count]
+        self.timers[:count] -= self.DECAY
+
+        alive = self.timers[:count] > 0
+        remaining = int(alive.sum())
+        if remaining == count:
+            return
+
+        # Fill the dead slots at the front with the live particles from the back
+        holes = np.flatnonzero(~alive[:remaining])
+        movers = np.flatnonzero(alive[remaining:]) + remaining
+        self.positions[holes] = self.positions[movers]
+        self.previous[holes] = self.previous[movers]
+        self.velocities[holes] = self.velocities[movers]
+        self.timers[holes] = self.timers[movers]
+        self.count = remaining
+        self.cursor %= max(remaining, 1)
+
+    def clear(self):
+        self.count = 0
+        self.cursor = 0
+
+    def draw(self, surface: pygame.Surface, alpha: float=1):
+        """
+        Draw every particle as a small dot by writing the pixels directly.
+        Arguments:
+            alpha: fraction of the way from the previous update to the current one
+        Returns:
+            list of the pygame.Rect objects drawn to, one per particle
+        """
+        if not self.count:
+            return []
+
+        positions = self.positions[:self.count]
+        if alpha != 1:
+            positions = self.previous[:self.count] + (positions-self.previous[:self.count])*alpha
+        pixels = (np.floor(positions).astype(int)[:, None, :] + DOT).reshape(-1, 2)
+        width, height = surface.get_size()
+        pixels = pixels[(pixels[:, 0] >= 0) & (pixels[:, 0] < width) & (pixels[:, 1] >= 0) & (pixels[:, 1] < height)]
+
+        try:
+            array = pygame.surfarray.pixels2d(surface)
+        except ValueError:  # 24 bit surfaces have no 2D pixel view
+            return [pygame.draw.circle(surface, self.color, position, 2) for position in positions]
+        array[pixels[:, 0], pixels[:, 1]] = surface.map_rgb(self.color)
+        del array
+
+        return [pygame.Rect(x-2, y-2, 4, 4) for x, y in np.floor(positions).astype(int).tolist()]
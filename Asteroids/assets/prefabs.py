@@ -0,0 +1,72 @@
+"""
+Module containing the asteroid shapes and their prefabs.
+A prefab is one shape at one scale, built once with all of its derived geometry.
+Asteroids in play are copies of a prefab's Polygon that share its vertices and
+collision template, so splitting a rock never sorts or centers vertices again.
+"""
+
+import numpy as np
+
+from assets.shapes import Polygon
+
+ASTEROID_SHAPES = [
+        [[23, 0],
+        [72, 12],
+        [79, 46],
+        [64, 71],
+        [25, 79],
+        [0, 51],
+        [0, 18]],
+
+        [[25, 0],
+        [79, 24],
+        [79, 54],
+        [46, 79],
+        [2, 61],
+        [0, 19]],
+
+        [[25, 2],
+        [66, 0],
+        [79, 38],
+        [67, 63],
+        [38, 79],
+        [14, 69],
+        [0, 20]]
+]
+
+class Prefab:
+    def __init__(self, shape: int, scale: float):
+        """
+        Creates a Prefab, the geometry shared by every asteroid of one shape and scale.
+        Arguments:
+            shape: index into ASTEROID_SHAPES
+            scale: scale factor of the shape
+        """
+        self.shape, self.scale = shape, scale
+        self.polygon = Polygon(ASTEROID_SHAPES[shape]).enlarge(scale)
+
+        # Ordered vertices relative to the center, not closed
+        self.outline = np.array(self.polygon.coordinates[:-1], dtype=float) - self.polygon.center
+        self.outline.flags.writeable = False
+        # Edges as (x1, y1, x2, y2) rows relative to the center
+        self.edges = np.hstack((self.outline, np.roll(self.outline, -1, axis=0)))
+        self.edges.flags.writeable = False
+
+        self.radius = float(np.sqrt((self.outline**2).sum(axis=1)).max())
+        x, y = self.outline[:, 0], self.outline[:, 1]
+        self.area = float(abs(x @ np.roll(y, -1) - y @ np.roll(x, -1)) / 2)
+        self.template = self.polygon.template  # Built once, here
+
+    def clone(self, center: tuple=None, angle: float=0):
+        """Returns a new Polygon of this prefab, sharing its vertices and collision template"""
+        return self.polygon.copy(center, angle)
+
+
+PREFABS = {}
+
+def get_prefab(shape: int, scale: float):
+    """Returns the Prefab of a shape at a scale, building it the first time it is asked for"""
+    key = (shape, scale)
+    if key not in PREFABS:
+        PREFABS[key] = Prefab(shape, scale)
+    return PREFABS[key]
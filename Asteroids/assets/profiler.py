@@ -0,0 +1,133 @@
+"""
+Module containing the frame-time profiler and its overlay.
+The main loop calls lap() after each phase of a frame. While the profiler is
+disabled it is falsy, so call sites can skip it with a single truth test.
+"""
+
+import pygame
+from collections import deque
+from time import perf_counter
+
+from assets.loader import ASSETS
+
+class Profiler:
+    def __init__(self, history: int=120, refresh: int=15):
+        """
+        Creates a disabled Profiler.
+        Arguments:
+            history: number of frames the averages, p99 and graph cover
+            refresh: frames between rebuilds of the overlay's text
+        """
+        self.enabled = False
+        self.history = history
+        self.REFRESH = refresh
+
+        self.phases = {}  # Phase name -> deque of per-frame times in ms
+        self.frames = deque(maxlen=history)  # Whole frame times in ms
+        self.current = {}
+        self.start = self.last = perf_counter()
+
+        self.font = None
+        self.text = None  # Cached surface of the overlay's text
+        self.frame_count = 0
+
+    def __bool__(self):
+        return self.enabled
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.phases.clear()
+        self.frames.clear()
+        self.current = {}
+        self.text = None
+        self.start = self.last = perf_counter()
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        self.current = {}
+        self.start = self.last = perf_counter()
+
+    def lap(self, phase: str):
+        """Add the time since the last lap to a phase of the current frame"""
+        now = perf_counter()
+        self.current[phase] = self.current.get(phase, 0) + now - self.last
+        self.last = now
+
+    def end_frame(self):
+        """Store the current frame's timings"""
+        now = perf_counter()
+        self.frames.append((now - self.start)*1000)
+        for phase in self.current:
+            if phase not in self.phases:
+                self.phases[phase] = deque(maxlen=self.history)
+        # Phases are kept in the order they were first seen, so the overlay reads top to bottom
+        for phase, times in self.phases.items():
+            times.append(self.current.get(phase, 0)*1000)
+        self.frame_count += 1
+        self.current = {}
+
+    def summary(self):
+        """
+        Returns:
+            dict of phase name -> (average ms, p99 ms), with the whole frame under "frame"
+        """
+        summary = {"frame": summarize(self.frames)}
+        for phase, times in self.phases.items():
+            summary[phase] = summarize(times)
+        return summary
+
+    def draw(self, surface: pygame.Surface, counts: dict, position: tuple=None):
+        """
+        Draw the overlay: per-phase averages and p99, object counts and a frame-time graph.
+        Arguments:
+            surface: pygame.Surface object
+            counts: dict of label -> number shown under the timings
+            position: top left corner, the top right of the surface if None
+        Returns:
+            list of the pygame.Rect objects drawn to
+        """
+        if self.font is None:
+            self.font = ASSETS.font(None, 18)
+        if self.text is None or not self.frame_count % self.REFRESH:
+            self.text = self.render_text(counts)
+
+        width = max(self.text.get_width(), self.history)
+        if position is None:
+            position = (surface.get_width() - width - 10, 10)
+        x, y = position
+        rects = [surface.blit(self.text, (x, y))]
+        rects.append(self.draw_graph(surface, pygame.Rect(x, y + self.text.get_height() + 4, self.history, 40)))
+        return rects
+
+    def render_text(self, counts: dict):
+        lines = []
+        for phase, (average, p99) in self.summary().items():
+            lines.append(f"{phase:<10} {average:6.2f} ms  p99 {p99:6.2f}")
+        lines.append("  ".join(f"{label} {number}" for label, number in counts.items()))
+
+        rendered = [self.font.render(line, True, (0, 255, 0), (0, 0, 0)) for line in lines]
+        text = pygame.Surface((max(line.get_width() for line in rendered), sum(line.get_height() for line in rendered)))
+        y = 0
+        for line in rendered:
+            text.blit(line, (0, y))
+            y += line.get_height()
+        return text
+
+    def draw_graph(self, surface: pygame.Surface, rect: pygame.Rect, budget: float=1000/60):
+        """Draw one bar per frame, scaled so the frame budget sits at half height"""
+        surface.fill((0, 0, 0), rect)
+        scale = rect.height / (2*budget)
+        for i, time in enumerate(self.frames):
+            height = min(rect.height, max(1, int(time*scale)))
+            color = (0, 255, 0) if time <= budget else (255, 0, 0)
+            pygame.draw.line(surface, color, (rect.x + i, rect.bottom - 1), (rect.x + i, rect.bottom - height))
+        pygame.draw.line(surface, (255, 255, 0), (rect.x, rect.bottom - rect.height//2), (rect.right - 1, rect.bottom - rect.height//2))
+        return rect
+
+
+def summarize(times):
+    """Returns the (average, p99) of a sequence of times"""
+    if not times:
+        return 0, 0
+    ordered = sorted(times)
+    return sum(ordered)/len(ordered), ordered[min(len(ordered) - 1, int(len(ordered)*0.99))]
@@ -0,0 +1,145 @@
+"""
+Module containing the dirty rectangle renderers for gameplay and for the menu scenes.
+Only the parts of the window that were drawn to this frame or the last one are cleared and updated.
+"""
+
+import pygame
+
+_owner = None  # Renderer that drew the window last
+
+def claim(renderer):
+    """Record that a renderer draws the window, returns True if another one drew it last"""
+    global _owner
+    changed = _owner is not renderer
+    _owner = renderer
+    return changed
+
+
+class DirtyRenderer:
+    def __init__(self, window: pygame.Surface, canvas: pygame.Surface, background=(0, 0, 0), max_rects: int=200, max_area: float=0.6):
+        """
+        Creates a DirtyRenderer that presents a canvas on the window.
+        Arguments:
+            window: the display surface
+            canvas: off-screen surface everything is drawn to
+            background: color the canvas is cleared to
+            max_rects: above this many dirty rects the whole window is updated instead
+            max_area: above this fraction of the window covered by dirty rects, counting overlaps,
+                the whole window is updated instead, since one full blit is cheaper than many partial ones
+        """
+        self.window = window
+        self.canvas = canvas
+        self.background = background
+        self.max_rects = max_rects
+        self.max_area = max_area*window.get_width()*window.get_height()
+
+        self.previous = []  # Rects drawn to in the last frame
+        self.previous_area = 0  # Their summed area
+        self.previous_full = True  # The last frame updated the whole window, so clearing it all costs no more
+        self.offset = (0, 0)
+        self.full = True  # The next frame redraws and updates the whole window
+        self.full_updates = 0
+        self.partial_updates = 0
+
+    def invalidate(self):
+        """Make the next frame a full update, e.g. after another scene drew to the window"""
+        self.full = True
+
+    def clear(self):
+        """Clear the regions drawn in the last frame, or the whole canvas after an invalidate"""
+        if self.full or self.previous_full:
+            self.canvas.fill(self.background)
+        else:
+            for rect in self.previous:
+                self.canvas.fill(self.background, rect)
+
+    def present(self, rects: list, offset: tuple=(0, 0)):
+        """
+        Show the canvas on the window.
+        Arguments:
+            rects: the pygame.Rect objects drawn to this frame
+            offset: where the canvas is blitted, anything but (0, 0) is a screen shake
+        """
+        rects = [rect.inflate(2, 2) for rect in rects if rect.width and rect.height]
+        offset = (offset[0], offset[1])
+
+        # Another scene drew over the window since the last frame
+        if claim(self):
+            self.full = True
+
+        area = sum(rect.width*rect.height for rect in rects)
+        # Shaking moves every pixel, and so does the frame after it stops
+        shaking = offset != (0, 0) or offset != self.offset
+        if (self.full or shaking or len(rects) + len(self.previous) > self.max_rects
+                or area + self.previous_area > self.max_area):
+            self.window.fill(self.background)
+            self.window.blit(self.canvas, offset)
+            pygame.display.update()
+            self.full_updates += 1
+            self.previous_full = True
+        else:
+            dirty = self.previous + rects
+            for rect in dirty:
+                self.window.blit(self.canvas, rect, rect)
+            pygame.display.update(dirty)
+            self.partial_updates += 1
+            self.previous_full = False
+
+        self.previous = rects
+        self.previous_area = area
+        self.offset = offset
+        self.full = False
+
+
+class SceneRenderer:
+    def __init__(self):
+        """
+        Creates a SceneRenderer for a scene that is mostly still, like a menu.
+        The static layer is composed once onto its own surface. Each frame only the rects the
+        moving things covered are restored from it and updated, and a frame where nothing
+        moved is not drawn at all.
+        """
+        self.background = None  # Static layer
+        self.composed = False
+        self.previous = []  # Rects drawn to in the last frame
+        self.frames_drawn = 0
+        self.frames_skipped = 0
+
+    def invalidate(self):
+        """Compose the static layer again on the next frame, e.g. after a button's hover state changed"""
+        self.composed = False
+
+    def present(self, window: pygame.Surface, compose, draw, changed: bool=True):
+        """
+        Show a frame of the scene.
+        Arguments:
+            window: the display surface
+            compose: function drawing the static layer onto the surface it is given
+            draw: function drawing the moving things onto the surface it is given, returning the pygame.Rect objects drawn to
+            changed: whether anything moving has changed since the last frame
+        Returns:
+            True if the window was updated
+        """
+        full = claim(self) or not self.composed
+        if not full and not changed:
+            self.frames_skipped += 1
+            return False
+
+        if not self.composed:
+            if self.background is None or self.background.get_size() != window.get_size():
+                self.background = pygame.Surface(window.get_size(), 0, window)
+            compose(self.background)
+            self.composed = True
+
+        if full:
+            window.blit(self.background, (0, 0))
+            self.previous = [rect.clip(window.get_rect()) for rect in draw(window)]
+            pygame.display.update()
+        else:
+            for rect in self.previous:
+                window.blit(self.background, rect, rect)
+            rects = [rect.clip(window.get_rect()) for rect in draw(window)]
+            pygame.display.update(self.previous + rects)
+            self.previous = rects
+        self.frames_drawn += 1
+        return True
@@ -0,0 +1,145 @@
+"""
+Module containing the input log format and the replay driver.
+A game is fully described by its seed and the keys held on every tick, so
+replaying a log re-executes the session exactly, as fast as the CPU allows.
+Run from the Asteroids directory with:
+    python -m assets.replay session.astr
+"""
+
+import argparse
+import hashlib
+import struct
+from time import perf_counter, sleep
+
+from pygame.locals import K_LEFT, K_RIGHT
+
+from assets import audio
+from assets.simulation import Simulation
+
+# Bits of the per-tick key state
+MOVE, FIRE, LEFT, RIGHT = 1, 2, 4, 8
+RESET = 16  # A new game was started before this tick
+
+MAGIC = b"ASTR"
+VERSION = 1
+HEADER = struct.Struct("<4sBHQI")  # magic, version, tick rate, seed, number of runs
+RUN = struct.Struct("<HB")  # number of ticks, key state
+MAX_RUN = 0xFFFF
+
+class InputLog:
+    def __init__(self, seed: int, rate: int=60):
+        """
+        Creates an empty InputLog.
+        Ticks are stored run-length encoded, as [state, ticks] pairs, since keys are
+        held for many ticks at a time.
+        Arguments:
+            seed: seed of the simulation the inputs belong to
+            rate: simulation ticks per second
+        """
+        self.seed = seed
+        self.rate = rate
+        self.runs = []
+
+    def __len__(self):
+        return sum(ticks for state, ticks in self.runs)
+
+    def __iter__(self):
+        """Yields the key state of every tick"""
+        for state, ticks in self.runs:
+            for i in range(ticks):
+                yield state
+
+    def record(self, move: bool=False, fire: bool=False, left: bool=False, right: bool=False, reset: bool=False):
+        """Append the keys held for one tick"""
+        self.append(MOVE*move | FIRE*fire | LEFT*left | RIGHT*right | RESET*reset)
+
+    def append(self, state: int):
+        """Append one tick of an already packed key state"""
+        if self.runs and self.runs[-1][0] == state and self.runs[-1][1] < MAX_RUN:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([state, 1])
+
+    def to_bytes(self):
+        data = [HEADER.pack(MAGIC, VERSION, self.rate, self.seed, len(self.runs))]
+        data += [RUN.pack(ticks, state) for state, ticks in self.runs]
+        return b"".join(data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        magic, version, rate, seed, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not an input log, or an unsupported version")
+        log = cls(seed, rate)
+        log.runs = [[state, ticks] for ticks, state in RUN.iter_unpack(data[HEADER.size:HEADER.size + count*RUN.size])]
+        return log
+
+    def save(self, path: str):
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def unpack(state: int):
+    """
+    Returns the simulation inputs of a packed key state.
+    Returns:
+        (move, fire, keys) as taken by Simulation.tick
+    """
+    return bool(state & MOVE), bool(state & FIRE), {K_LEFT: bool(state & LEFT), K_RIGHT: bool(state & RIGHT)}
+
+
+def state_digest(simulation: Simulation):
+    """Returns a short hash of the game state, equal for two runs that played out the same"""
+    digest = hashlib.sha1()
+    digest.update(struct.pack("<qqi", simulation.ticks, simulation.score, simulation.player.health))
+    digest.update(struct.pack("<2d", *simulation.player.center))
+    digest.update(simulation.asteroids.asteroids.positions.tobytes())
+    digest.update(simulation.bullets.positions[:len(simulation.bullets)].tobytes())
+    return digest.hexdigest()[:16]
+
+
+def replay(log: InputLog, speed: float=None, width: int=650, height: int=650):
+    """
+    Re-execute a recorded session.
+    Arguments:
+        log: InputLog of the session
+        speed: multiple of real time to run at, as fast as possible if None
+    Returns:
+        (simulation, seconds taken)
+    """
+    audio.disable()
+    simulation = Simulation(width, height, log.seed)
+
+    start = perf_counter()
+    for tick, state in enumerate(log):
+        if state & RESET:
+            simulation.reset()
+        simulation.tick(*unpack(state))
+        if speed:
+            delay = start + (tick + 1)/(log.rate*speed) - perf_counter()
+            if delay > 0:
+                sleep(delay)
+    return simulation, perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded Asteroids session without a display.")
+    parser.add_argument("path", help="input log written by main.py --record")
+    parser.add_argument("--speed", type=float, default=None, help="multiple of real time to run at (default: as fast as possible)")
+    args = parser.parse_args()
+
+    log = InputLog.load(args.path)
+    simulation, seconds = replay(log, args.speed)
+    ticks = len(log)
+    print(f"seed {log.seed}, {ticks} ticks in {seconds:.2f}s: {ticks/max(seconds, 1e-9):.0f} ticks/s, "
+          f"{ticks/log.rate/max(seconds, 1e-9):.1f}x real time")
+    print(f"score {simulation.score}, health {simulation.player.health}, state {state_digest(simulation)}")
+
+
+if __name__ == '__main__':
+    main()
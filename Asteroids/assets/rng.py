@@ -0,0 +1,25 @@
+"""
+Module containing the seeded random number streams of a game.
+Every subsystem draws from its own stream, so extra random calls in one
+subsystem (e.g. more particles) never change what happens in another.
+"""
+
+import random
+
+class RandomStreams:
+    def __init__(self, seed: int=None):
+        """
+        Creates a set of RandomStreams.
+        Arguments:
+            seed: master seed, a random one is picked if None. It is taken modulo 2**64,
+                so any integer gives a seed that fits in a replay file
+        """
+        self.seed = seed % 2**64 if seed is not None else random.randrange(2**64)
+        self.streams = {}
+
+    def __getitem__(self, name: str):
+        """Returns the random.Random stream of a subsystem, creating it on first use"""
+        if name not in self.streams:
+            # String seeds are hashed the same way on every platform and run
+            self.streams[name] = random.Random(f"{self.seed}/{name}")
+        return self.streams[name]
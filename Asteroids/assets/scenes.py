@@ -4,100 +4,58 @@ import sys
 import random
 
 from assets.interface import Button
-from assets.shapes import Polygon
-
-pygame.font.init()
-pygame.mixer.init()
-
-FONT_1 = pygame.font.Font("assets/fonts/rexlia rg.otf", 50)  # 60 pts high
-FONT_2 = pygame.font.Font("assets/fonts/rexlia rg.otf", 30)  # 36 pts high
-
-MOUSE = pygame.image.load("assets/images/mouse.png")
-MOUSE.set_colorkey((0, 0, 0))
-
-CLICK_SOUND = pygame.mixer.Sound("assets/sounds/click.wav")
-CLICK_SOUND.set_volume(0.25)
+from assets.particles import Particles
+from assets.cache import SPRITES
+from assets.hud import get_atlas
+from assets.loader import ASSETS, FONT
+from assets.audio import AUDIO
+from assets.prefabs import get_prefab
+from assets.render import SceneRenderer
 
 class Menu:
     def __init__(self):
+        FONT_1, FONT_2 = ASSETS.font(FONT, 50), ASSETS.font(FONT, 30)  # 60 and 36 pts high
+        self.MOUSE = ASSETS.image("assets/images/mouse.png", (0, 0, 0))
+        self.CLICK_SOUND = ASSETS.sound("assets/sounds/click.wav", 0.25)
+
         self.TITLE = FONT_1.render("ASTEROIDS", True, (255, 255, 255))
         self.PLAY_TEXT = FONT_2.render("PLAY", True, (255, 255, 255))
         self.QUIT_TEXT = FONT_2.render("QUIT", True, (255, 255, 255))
 
         self.PLAY_BUTTON = Button(self.PLAY_TEXT, self.PLAY_TEXT, (40, 110))
         self.QUIT_BUTTON = Button(self.QUIT_TEXT, self.QUIT_TEXT, (40, 166))
+        self.BUTTONS = [self.PLAY_BUTTON, self.QUIT_BUTTON]
 
         self.menu = True
-
-        self.ASTEROID_SHAPES = [
-                [[23, 0],
-                [72, 12],
-                [79, 46],
-                [64, 71],
-                [25, 79],
-                [0, 51],
-                [0, 18]],
-
-                [[25, 0],
-                [79, 24],
-                [79, 54],
-                [46, 79],
-                [2, 61],
-                [0, 19]],
-
-                [[25, 2],
-                [66, 0],
-                [79, 38],
-                [67, 63],
-                [38, 79],
-                [14, 69],
-                [0, 20]]
+        self.layer = SceneRenderer()
+        self.mouse = None  # Cursor position and button hover states of the last frame
+        self.hover = None
+        self.animating = False  # Particles were drawn in the last frame
+
+        # Background asteroids as (template, scale, center)
+        self.asteroids = [(0, 2, (624, 624)), 
+                        (1, 2, (635, 490)), 
+                        (1, 2, (475, 630)), 
+                        (2, 1, (370, 637)), 
+                        (2, 1, (642, 383)), 
+                        (2, 1, (540, 550)), 
+                        (0, 0.75, (641, 320)), 
+                        (0, 0.75, (311, 634)), 
+                        (0, 0.4, (562, 340)), 
+                        (1, 0.5, (519, 456)), 
+                        (2, 0.6, (380, 542)), 
         ]
+        self.outlines = {(template, scale): get_prefab(template, scale).outline for template, scale, center in self.asteroids}
 
-        self.asteroids = [Polygon(self.ASTEROID_SHAPES[0]).enlarge(2).move_to((624, 624)),
-                        Polygon(self.ASTEROID_SHAPES[1]).enlarge(2).move_to((635, 490)),
-                        Polygon(self.ASTEROID_SHAPES[1]).enlarge(2).move_to((475, 630)),
-                        Polygon(self.ASTEROID_SHAPES[2]).enlarge(1).move_to((370, 637)),
-                        Polygon(self.ASTEROID_SHAPES[2]).enlarge(1).move_to((642, 383)),
-                        Polygon(self.ASTEROID_SHAPES[2]).enlarge(1).move_to((540, 550)),
-                        Polygon(self.ASTEROID_SHAPES[0]).enlarge(0.75).move_to((641, 320)),
-                        Polygon(self.ASTEROID_SHAPES[0]).enlarge(0.75).move_to((311, 634)),
-                        Polygon(self.ASTEROID_SHAPES[0]).enlarge(0.4).move_to((562, 340)),
-                        Polygon(self.ASTEROID_SHAPES[1]).enlarge(0.5).move_to((519, 456)),
-                        Polygon(self.ASTEROID_SHAPES[2]).enlarge(0.6).move_to((380, 542)),
-        ]
-
-        self.particles = []
-        self.DECAY = 0.8
+        self.particles = Particles(decay=0.8)
         self.counters = [0, 0, 0]
         self.timers = [random.randint(90, 150), random.randint(90, 150), random.randint(90, 150)]
 
     def spawn_particles(self, coord):
-        number = random.randint(4, 6)
-        x_vels = []
-        y_vels = []
-        for i in range (number):
-            x_vel = random.uniform(-1.5, 1.5)
-            while (x_vel in x_vels) or -0.1 < x_vel < 0.1: 
-                x_vel = random.uniform(-1.5, 1.5)
-            x_vels.append(x_vel)
-            
-            y_vel = random.uniform(-1.5, 1.5)
-            while (y_vel in y_vels) or -0.1 < y_vel < 0.1: 
-                y_vel = random.uniform(-1.5, 1.5)
-            y_vels.append(y_vels)
-            
-            timer = random.randint(45, 60)
-            
-            self.particles.append([coord[:], x_vel, y_vel, timer])
+        self.particles.spawn(coord, random.randint(4, 6))
 
     def handle_particles(self):
-        for index, particle in reversed(list(enumerate(self.particles))):
-            particle[0][0] += particle[1]
-            particle[0][1] += particle[2]
-            particle[3] -= self.DECAY 
-            if particle[3] <= 0: 
-                self.particles.pop(index)
+        self.particles.update()
 
     def loop(self, surface):
         
@@ -107,7 +65,7 @@ class Menu:
                 sys.exit()
             if event.type == MOUSEBUTTONDOWN:
                 if self.PLAY_BUTTON.execute():
-                    CLICK_SOUND.play()
+                    AUDIO.play(self.CLICK_SOUND, "ui")
                     self.menu = False
                 if self.QUIT_BUTTON.execute():
                     pygame.quit()
@@ -122,19 +80,34 @@ class Menu:
 
         self.handle_particles()
 
+        mouse = pygame.mouse.get_pos()
+        hover = hovered(self.BUTTONS, mouse)
+        if hover != self.hover:
+            self.layer.invalidate()
+        changed = mouse != self.mouse or self.animating or bool(len(self.particles))
+        self.mouse, self.hover, self.animating = mouse, hover, bool(len(self.particles))
+        self.layer.present(surface, self.compose, self.draw, changed)
+
+    def compose(self, surface):
+        """Draw the parts of the menu that only change with a button's hover state"""
         surface.fill((0, 0, 0))
         surface.blit(self.TITLE, (40, 30))
         self.PLAY_BUTTON.draw(surface)
         self.QUIT_BUTTON.draw(surface)
-        for asteroid in self.asteroids:
-            asteroid.draw(surface, (255, 255, 255), 2)
-        for particle in self.particles:
-            pygame.draw.circle(surface, (255, 255, 255), particle[0], 2)
-        surface.blit(MOUSE, pygame.mouse.get_pos())
-        pygame.display.update()
+        SPRITES.draw(surface, [((template, scale), self.outlines[(template, scale)], center, 0) for template, scale, center in self.asteroids])
+
+    def draw(self, surface):
+        """Draw the particles and the cursor, returning the rects drawn to"""
+        rects = self.particles.draw(surface)
+        rects.append(surface.blit(self.MOUSE, self.mouse))
+        return rects
 
 class Game_over:
     def __init__(self, surface):
+        FONT_1, FONT_2 = ASSETS.font(FONT, 50), ASSETS.font(FONT, 30)
+        self.MOUSE = ASSETS.image("assets/images/mouse.png", (0, 0, 0))
+        self.CLICK_SOUND = ASSETS.sound("assets/sounds/click.wav", 0.25)
+
         self.GAME_OVER_TEXT = FONT_1.render("GAME  OVER", True, (255, 255, 255))
         self.RETRY_TEXT = FONT_2.render("RETRY", True, (255, 255, 255))
         self.MENU_TEXT = FONT_2.render("MENU", True, (255, 255, 255))
@@ -143,15 +116,24 @@ class Game_over:
         self.RETRY_BUTTON = Button(self.RETRY_TEXT, self.RETRY_TEXT, (surface.get_width()//2-self.RETRY_TEXT.get_width()//2, surface.get_height()//2))
         self.MENU_BUTTON = Button(self.MENU_TEXT, self.MENU_TEXT, (surface.get_width()//2-self.MENU_TEXT.get_width()//2, surface.get_height()//2+55))
         self.QUIT_BUTTON = Button(self.QUIT_TEXT, self.QUIT_TEXT, (surface.get_width()//2-self.QUIT_TEXT.get_width()//2, surface.get_height()//2+110))
+        self.BUTTONS = [self.RETRY_BUTTON, self.MENU_BUTTON, self.QUIT_BUTTON]
+
+        self.layer = SceneRenderer()
+        self.mouse = None
+        self.hover = None
+
+        self.SCORE_GLYPHS = get_atlas(FONT_2, "SCORE: 0123456789")
+        self.score = None
+        self.score_text = None
 
         self.game_over = False
         self.play = False
-        self.GAME_OVER_SOUND = pygame.mixer.Sound("assets/sounds/game over.wav")
+        self.GAME_OVER_SOUND = ASSETS.sound("assets/sounds/game over.wav")
 
     def loop(self, surface, score, menu):
         if not self.play:
             self.play = True
-            self.GAME_OVER_SOUND.play()
+            AUDIO.play(self.GAME_OVER_SOUND, "player")
         reset = False
 
         for event in pygame.event.get():
@@ -160,7 +142,7 @@ class Game_over:
                 sys.exit()
             if event.type == MOUSEBUTTONDOWN:
                 if self.RETRY_BUTTON.execute():
-                    CLICK_SOUND.play()
+                    AUDIO.play(self.CLICK_SOUND, "ui")
                     reset = True
                     self.game_over = False
                     self.play = False
@@ -168,36 +150,62 @@ class Game_over:
                     pygame.quit()
                     sys.exit()
                 if self.MENU_BUTTON.execute():
-                    CLICK_SOUND.play()
+                    AUDIO.play(self.CLICK_SOUND, "ui")
                     menu.menu = True
                     reset = True
                     self.game_over = False
                     self.play = False
 
-        score_text = FONT_2.render(f"SCORE: {score}", True, (255, 255, 255))
+        if score != self.score:
+            self.score = score
+            self.score_text = self.SCORE_GLYPHS.render(f"SCORE: {score}")
+            self.layer.invalidate()
+
+        mouse = pygame.mouse.get_pos()
+        hover = hovered(self.BUTTONS, mouse)
+        if hover != self.hover:
+            self.layer.invalidate()
+        changed = mouse != self.mouse
+        self.mouse, self.hover = mouse, hover
+        self.layer.present(surface, self.compose, self.draw, changed)
+
+        return reset
 
+    def compose(self, surface):
+        """Draw everything but the cursor"""
+        score_text = self.score_text
         surface.fill((0, 0, 0))
         surface.blit(self.GAME_OVER_TEXT, (surface.get_width()//2-self.GAME_OVER_TEXT.get_width()//2, surface.get_height()//4))
         surface.blit(score_text, (surface.get_width()//2-score_text.get_width()//2, surface.get_height()//2-55))
         self.RETRY_BUTTON.draw(surface)
         self.MENU_BUTTON.draw(surface)
         self.QUIT_BUTTON.draw(surface)
-        surface.blit(MOUSE, pygame.mouse.get_pos())
-        pygame.display.update()
 
-        return reset
+    def draw(self, surface):
+        return [surface.blit(self.MOUSE, self.mouse)]
 
 class Pause:
     def __init__(self, surface):
+        FONT_1, FONT_2 = ASSETS.font(FONT, 50), ASSETS.font(FONT, 30)
+        self.MOUSE = ASSETS.image("assets/images/mouse.png", (0, 0, 0))
+        self.CLICK_SOUND = ASSETS.sound("assets/sounds/click.wav", 0.25)
+
         self.PAUSED_TEXT = FONT_1.render("PAUSED", True, (255, 255, 255))
         self.PLAY_TEXT = FONT_2.render("PLAY", True, (255, 255, 255))
         self.EXIT_TEXT = FONT_2.render("EXIT", True, (255, 255, 255))
 
         self.PLAY_BUTTON = Button(self.PLAY_TEXT, self.PLAY_TEXT, (surface.get_width()//2-self.PLAY_TEXT.get_width()//2, surface.get_height()//2-55))
         self.EXIT_BUTTON = Button(self.EXIT_TEXT, self.EXIT_TEXT, (surface.get_width()//2-self.EXIT_TEXT.get_width()//2, surface.get_height()//2))
+        self.BUTTONS = [self.PLAY_BUTTON, self.EXIT_BUTTON]
 
-    def loop(self, window, surface, menu, clock, fps):
+        self.layer = SceneRenderer()
+        self.mouse = None
+        self.hover = None
+
+    def loop(self, window, surface, menu, scheduler):
         reset = False
+        self.frozen = surface
+        self.layer.invalidate()  # The frozen game is only copied once per pause
         while True:
 
             for event in pygame.event.get():
@@ -206,23 +214,39 @@ class Pause:
                     sys.exit()
                 if event.type == KEYDOWN:
                     if event.key == K_p:
-                        CLICK_SOUND.play()
+                        AUDIO.play(self.CLICK_SOUND, "ui")
                         return reset
                 if event.type == MOUSEBUTTONDOWN:
                     if self.PLAY_BUTTON.execute():
-                        CLICK_SOUND.play()
+                        AUDIO.play(self.CLICK_SOUND, "ui")
                         return
                     if self.EXIT_BUTTON.execute():
-                        CLICK_SOUND.play()
+                        AUDIO.play(self.CLICK_SOUND, "ui")
                         menu.menu = True
                         reset = True
                         return reset
 
-            window.blit(surface, (0, 0))
-            window.blit(self.PAUSED_TEXT, (surface.get_width()//2-self.PAUSED_TEXT.get_width()//2, window.get_height()//4))
-            self.PLAY_BUTTON.draw(window)
-            self.EXIT_BUTTON.draw(window)
-            window.blit(MOUSE, pygame.mouse.get_pos())
-            pygame.display.update()
+            mouse = pygame.mouse.get_pos()
+            hover = hovered(self.BUTTONS, mouse)
+            if hover != self.hover:
+                self.layer.invalidate()
+            changed = mouse != self.mouse
+            self.mouse, self.hover = mouse, hover
+            self.layer.present(window, self.compose, self.draw, changed)
+
+            scheduler.wait()
+
+    def compose(self, surface):
+        """Draw the frozen game with the pause menu over it"""
+        surface.blit(self.frozen, (0, 0))
+        surface.blit(self.PAUSED_TEXT, (self.frozen.get_width()//2-self.PAUSED_TEXT.get_width()//2, surface.get_height()//4))
+        self.PLAY_BUTTON.draw(surface)
+        self.EXIT_BUTTON.draw(surface)
+
+    def draw(self, surface):
+        return [surface.blit(self.MOUSE, self.mouse)]
+
 
-            clock.tick(fps)
\ No newline at end of file
+def hovered(buttons: list, position: tuple):
+    """Returns which of the buttons the position is over, as a tuple of bools"""
+    return tuple(bool(button.rect.collidepoint(position)) for button in buttons)
@@ -5,7 +5,10 @@ Supports pixel perfect collision for extension objects and normal pygame objects
 """
 
 import pygame
-from math import sqrt, cos, sin, radians
+import weakref
+import numpy as np
+from collections import OrderedDict
+from math import sqrt, cos, sin, radians, atan2
 
 class Circle:
     def __init__(self, center: tuple, radius: float):
@@ -34,79 +37,34 @@ class Circle:
         return False
 
     def collidelines(self, lines):
-        for line in lines:
-            if line[0] not in ["x", "y"]:
-                m_in = -1/line[0]
-                c_in = self._y - (m_in*self._x)
-                x = (c_in-line[1]) / (line[0]-m_in)
-                y = (m_in*x) + c_in
-                length = sqrt((self._x - x)**2 + (self._y - y)**2)
-                if (length <= self.radius) and (line[3][0] <= x <= line[3][1]):
-                    return True
-
-            elif line[0] == "x":
-                point = self.radius**2 - (line[1]-self._x)**2
-                if point < 0: 
-                    continue
-                y1 = self._y + sqrt(point)
-                y2 = self._y - sqrt(point)
-                if (line[4][0] <= self._y <= line[4][1]) and (line[4][0] <= y1 <= line[4][1]) and (line[4][0] <= y2 <= line[4][1]):
-                    return True
-            elif line[0] == "y":
-                point = self.radius**2 - (line[1]-self._y)**2
-                if point < 0: 
-                    continue
-                x1 = self._x + sqrt(point)
-                x2 = self._x - sqrt(point)
-                if (line[3][0] <= self._x <= line[3][1]) and (line[3][0] <= x1 <= line[3][1]) and (line[3][0] <= x2 <= line[3][1]):
-                    return True
-        
-        return False
+        """
+        Test if any of the lines pass through the circle.
+        Arguments:
+            lines: array of segments, one (x1, y1, x2, y2) row per line
+        Returns:
+            True if collision detected and False if not
+        """
+        return bool(segments_circle(lines, self._center, self.radius).any())
 
     def collideline(self, line):
-        if line[0] not in ["x", "y"]:
-            m_in = -1/line[0]
-            c_in = self._y - (m_in*self._x)
-            x = (c_in-line[1]) / (line[0]-m_in)
-            y = (m_in*x) + c_in
-            length = sqrt((self._x - x)**2 + (self._y - y)**2)
-            if (length <= self.radius) and (line[3][0] <= x <= line[3][1]):
-                return True
-
-        elif line[0] == "x":
-            point = self.radius**2 - (line[1]-self._x)**2
-            if point < 0: 
-                return False
-            y1 = self._y + sqrt(point)
-            y2 = self._y - sqrt(point)
-            if (line[4][0] <= self._y <= line[4][1]) and (line[4][0] <= y1 <= line[4][1]) and (line[4][0] <= y2 <= line[4][1]):
-                return True
-
-        elif line[0] == "y":
-            point = self.radius**2 - (line[1]-self._y)**2
-            if point < 0: 
-                return False
-            x1 = self._x + sqrt(point)
-            x2 = self._x - sqrt(point)
-            if (line[3][0] <= self._x <= line[3][1]) and (line[3][0] <= x1 <= line[3][1]) and (line[3][0] <= x2 <= line[3][1]):
-                return True
-        
-        return False
+        """
+        Test if a line passes through the circle.
+        Arguments:
+            line: segment, (x1, y1, x2, y2)
+        Returns:
+            True if collision detected and False if not
+        """
+        return bool(segments_circle(line, self._center, self.radius).any())
 
     def collidepolygon(self, polygon):
         if self.rect.colliderect(polygon.rect):
             if polygon.collidepoint(self._center):
                 return True
-            
-            for coord in polygon.coordinates:
-                if self.collidepoint(coord):
-                    return True
 
             if self.collidelines(polygon.boundaries):
                 return True
             
-        else:
-            return False
+        return False
 
     def colliderect(self, rect: pygame.Rect):
         """
@@ -159,7 +117,7 @@ class Circle:
         return self
 
     def draw(self, surface, color, width=0):
-        pygame.draw.circle(surface, color, self._center, self.radius, width)
+        return pygame.draw.circle(surface, color, self._center, self.radius, width)
 
     @property
     def center(self):
@@ -191,80 +149,76 @@ class Circle:
 
 
 class Polygon:
-    def __init__(self, coordinates: list):
+    def __init__(self, coordinates: list, ordered: bool=False):
         """
-        Creates a Polygon object
+        Creates a Polygon object.
+        The vertices are stored once relative to the polygon's center, together with a
+        translation (the center) and a rotation. World coordinates, the rect and the
+        boundaries are only rebuilt when a draw or collision call asks for them.
         Arguments:
             coordinates: a list of coordinates
+            ordered: the coordinates are already in order around the polygon, so they are not sorted
         """
-        self.reorder_coords(coordinates)
+        self.reorder_coords(coordinates, ordered)
         self.create_center()
-        self.create_boundaries()
-
-    def reorder_coords(self, coordinates):
-        """Re-organise the coordinates and define the midpoint of the Polygon"""
-        copy_coords = []
-        [copy_coords.append(i) for i in coordinates if i not in copy_coords]
-
-
-        lengths = [sqrt(i[0]**2 + i[1]**2) for i in copy_coords]
-        next_coord = copy_coords[lengths.index(min(lengths))]
-        self._coordinates = [list(next_coord)]
-        copy_coords.remove(next_coord)
-
-        for j in range(len(copy_coords)):
-            right_coords = [i for i in copy_coords if i[0] >= next_coord[0]]
-            left_coords = [i for i in copy_coords if i[0] < next_coord[0]]
-            if len(right_coords) > 0:
-                lengths = [sqrt((next_coord[0] - i[0])**2 + (next_coord[1] - i[1])**2) for i in right_coords]
-                next_coord = right_coords[lengths.index(min(lengths))]
-            else:
-                lengths = [sqrt((next_coord[0] - i[0])**2 + (next_coord[1] - i[1])**2) for i in left_coords]
-                next_coord = left_coords[lengths.index(min(lengths))]
-            self._coordinates.append(list(next_coord))
-            copy_coords.remove(next_coord)
-        
-        self._coordinates.append(self._coordinates[0])
 
-        x, y = zip(*self._coordinates)
-        self.rect = pygame.Rect(min(x), min(y), max(x)-min(x)+1, max(y)-min(y)+1)
+    def reorder_coords(self, coordinates, ordered: bool=False):
+        """
+        Re-organise the coordinates and define the midpoint of the Polygon.
+        The vertices are sorted by their angle around the midpoint, clockwise on screen,
+        starting from the vertex closest to the origin.
+        """
+        unique = list(dict.fromkeys((coord[0], coord[1]) for coord in coordinates))
+        if ordered:
+            vertices = unique
+        else:
+            x = sum(coord[0] for coord in unique) / len(unique)
+            y = sum(coord[1] for coord in unique) / len(unique)
+            vertices = sorted(unique, key=lambda coord: atan2(coord[1]-y, coord[0]-x))
+            lengths = [coord[0]**2 + coord[1]**2 for coord in vertices]
+            first = lengths.index(min(lengths))
+            vertices = vertices[first:] + vertices[:first]
+
+        vertices = [list(coord) for coord in vertices]
+        vertices.append(vertices[0])
+
+        # Store the ordered vertices in local space, unrotated, with the origin at the first vertex
+        self._local = [[i[0]-vertices[0][0], i[1]-vertices[0][1]] for i in vertices]
+        self._center = list(vertices[0])
+        self._angle = 0
+        self._template = None
+        self._dirty = True
 
     def create_center(self):
-        self._center = [sum([i[0] for i in self._coordinates[1:]]) / len(self._coordinates[1:]), sum([i[1] for i in self._coordinates[1:]]) / len(self._coordinates[1:])]
+        """
+        Move the local origin to the midpoint of the vertices, keeping the world coordinates unchanged.
+        Only called right after reorder_coords, so the polygon is never rotated here.
+        """
+        x, y = [sum([i[0] for i in self._local[1:]]) / len(self._local[1:]), sum([i[1] for i in self._local[1:]]) / len(self._local[1:])]
+        self._local = [[i[0]-x, i[1]-y] for i in self._local]
+        self._template = None
+        self._center = [self._center[0]+x, self._center[1]+y]
+        self._dirty = True
+
+    def update(self):
+        """Rebuild the world coordinates and rect from the local vertices and the transform"""
+        x, y = self._center
+        if self._angle:
+            s, c = sincos(self._angle)
+            self._coordinates = [[c*i[0] - s*i[1] + x, s*i[0] + c*i[1] + y] for i in self._local]
+        else:
+            self._coordinates = [[i[0]+x, i[1]+y] for i in self._local]
 
-    def create_boundaries(self):
-        """Generate the polygon's boundaries for collision testing"""
+        _x, _y = zip(*self._coordinates)
+        self._rect = pygame.Rect(min(_x), min(_y), max(_x)-min(_x)+1, max(_y)-min(_y)+1)
+        self._boundaries = None
+        self._dirty = False
 
-        self.boundaries = []
-        for i in range(len(self.coordinates)-1):
+    def create_boundaries(self):
+        """Generate the polygon's boundaries for collision testing, one (x1, y1, x2, y2) row per edge"""
 
-            if self.coordinates[i][0] == self.coordinates[i+1][0]:
-                gradient = "x"
-                y_intercept = self.coordinates[i][0]
-                if self.coordinates[i][0] >= self._center[0]: 
-                    comparator = "<="
-                else: 
-                    comparator = ">="
-
-            elif self.coordinates[i][1] == self.coordinates[i+1][1]:
-                gradient = "y"
-                y_intercept = self.coordinates[i][1]
-                if self.coordinates[i][1] >= self._center[1]: 
-                    comparator = "<="
-                else: 
-                    comparator = ">="
-
-            else:
-                gradient = (self.coordinates[i][1]-self.coordinates[i+1][1]) / (self.coordinates[i][0]-self.coordinates[i+1][0])
-                y_intercept = self.coordinates[i][1] - (gradient*self.coordinates[i][0])
-                if (gradient*self._center[0]) + y_intercept >= self._center[1]: 
-                    comparator = "<="
-                else: 
-                    comparator = ">="
-
-            x, y = zip(*self._coordinates[i:i+2])
-
-            self.boundaries.append([gradient, y_intercept, comparator, (min(x), max(x)), (min(y), max(y))])
+        self._boundaries = coords_to_segments(self.coordinates)
+        return self._boundaries
 
     def collidepoint(self, coord):
         """
@@ -274,105 +228,29 @@ class Polygon:
         Returns:
             True if point is within the polygon and False if not
         """
-        collision = False
-        for line in self.boundaries:
-            if line[0] == "x":
-                if line[2] == "<=": 
-                    if (coord[0] <= line[1]):
-                        collision = True
-                    else: 
-                        return False
-                else: 
-                    if (coord[0] >= line[1]):
-                        collision = True
-                    else: 
-                        return False
-
-            elif line[0] == "y":
-                if line[2] == "<=": 
-                    if (coord[1] <= line[1]):
-                        collision = True
-                    else: 
-                        return False
-                else: 
-                    if (coord[1] >= line[1]):
-                        collision = True
-                    else: 
-                        return False
-
-            else:
-                if line[2] == "<=":
-                    if coord[1] <= (line[0]*coord[0]) + line[1]:
-                        collision = True
-                    else: 
-                        return False
-                else:
-                    if coord[1] >= (line[0]*coord[0]) + line[1]:
-                        collision = True
-                    else: 
-                        return False
-
-        return collision
+        return bool(points_in_segments(self.boundaries, [coord], self._center)[0])
 
     def collidelines(self, lines):
         """
         Test if a line is colliding with the polygon.
         Arguments:
-            lines: a list of values used.
+            lines: array of segments, one (x1, y1, x2, y2) row per line
         Returns:
             True if intersection detected and False if not
         """
 
-        for boundary in self.boundaries:
-            for line in lines:
-                if (boundary[0] == line[0]) and (boundary[1] == line[1]): 
-                    return True
-                elif (boundary[0] == "x") and (line[0] == "y") and (boundary[4][0] <= line[1] <= boundary[4][1]) and (line[3][0] <= boundary[1] <= line[3][1]): 
-                    return True
-                elif (boundary[0] == "y") and (line[0] == "x") and (boundary[3][0] <= line[1] <= boundary[3][1]) and (line[4][0] <= boundary[1] <= line[4][1]): 
-                    return True
-
-                elif boundary[0] not in ["x", "y"]:
-                    if (line[0] == "x") and (boundary[3][0] <= line[1] <= boundary[3][1]) and (line[4][0] <= (line[1]*boundary[0])+boundary[1] <= line[4][1]): 
-                        return True
-                    elif (line[0] == "y") and (boundary[4][0] <= line[1] <= boundary[4][1]) and (line[3][0] <= (line[1]-boundary[1])/boundary[0] <= line[3][1]): 
-                        return True
-                    elif line[0] not in ["x", "y"]:
-                        if boundary[0] == line[0]: 
-                            continue
-                        elif (boundary[3][0] <= (line[1]-boundary[1])/(boundary[0]-line[0]) <= boundary[3][1]) and (line[3][0] <= (line[1]-boundary[1])/(boundary[0]-line[0]) <= line[3][1]):
-                            return True
-        
-        return False
+        return bool(segments_intersect(self.boundaries, lines).any())
 
     def collideline(self, line):
         """
         Test if a line is colliding with the polygon.
         Arguments:
-            line: a list of values used.
+            line: segment, (x1, y1, x2, y2)
         Returns:
             True if intersection detected and False if not
         """
 
-        for boundary in self.boundaries:
-            if (boundary[0] == line[0]) and (boundary[1] == line[1]): 
-                return True
-            elif (boundary[0] == "x") and (line[0] == "y") and (boundary[4][0] <= line[1] <= boundary[4][1]) and (line[3][0] <= boundary[1] <= line[3][1]): 
-                return True
-            elif (boundary[0] == "y") and (line[0] == "x") and (boundary[3][0] <= line[1] <= boundary[3][1]) and (line[4][0] <= boundary[1] <= line[4][1]): 
-                return True
-
-            elif boundary[0] not in ["x", "y"]:
-                if (line[0] == "x") and (boundary[3][0] <= line[1] <= boundary[3][1]) and (line[4][0] <= (line[1]*boundary[0])+boundary[1] <= line[4][1]): 
-                    return True
-                elif (line[0] == "y") and (boundary[4][0] <= line[1] <= boundary[4][1]) and (line[3][0] <= (line[1]-boundary[1])/boundary[0] <= line[3][1]): 
-                    return True
-                elif line[0] not in ["x", "y"]:
-                    if boundary[0] == line[0]: continue
-                    elif (boundary[3][0] <= (line[1]-boundary[1])/(boundary[0]-line[0]) <= boundary[3][1]) and (line[3][0] <= (line[1]-boundary[1])/(boundary[0]-line[0]) <= line[3][1]): 
-                        return True
-
-        return False
+        return bool(segments_intersect(self.boundaries, line).any())
 
     def colliderect(self, rect: pygame.Rect):
         """
@@ -383,24 +261,14 @@ class Polygon:
             True if collision detected and False if not
         """
 
-        rect_coords = [rect.topleft, rect.topright, rect.bottomright, rect.bottomleft]
-
-        rect_lines = [["y", rect.top, "", (rect.left, rect.right), (rect.top, rect.top)], 
-                    ["x", rect.right, "", (rect.right, rect.right), (rect.top, rect.bottom)], 
-                    ["y", rect.bottom, "", (rect.left, rect.right), (rect.bottom, rect.bottom)], 
-                    ["x", rect.left, "", (rect.left, rect.left), (rect.top, rect.bottom)]
-        ]
-
         if self.rect.colliderect(rect):
-            for coord in self._coordinates:
-                if rect.collidepoint(coord):
-                    return True
+            if rect.collidepoint(self.coordinates[0]):
+                return True
 
-            for coord in rect_coords:
-                if self.collidepoint(coord):
-                    return True
+            if self.collidepoint(rect.topleft):
+                return True
                     
-            if self.collidelines(rect_lines):
+            if self.collidelines(rect_to_segments(rect)):
                 return True
         
         return False
@@ -409,43 +277,35 @@ class Polygon:
         if self.rect.colliderect(circle.rect):
             if self.collidepoint(circle.center):
                 return True
-            
-            for coord in self._coordinates:
-                if circle.collidepoint(coord):
-                    return True
 
             if circle.collidelines(self.boundaries):
                 return True
         
         return False
 
-    def collidepolygon(self, polygon):
-        if self.rect.colliderect(polygon.rect):
-            for coord in self._coordinates:
-                if polygon.collidepoint(coord):
-                    return True
-            
-            for coord in polygon.coordinates:
-                if self.collidepoint(coord):
-                    return True
-        
-            if self.collidelines(polygon.boundaries):
-                return True
-
-        return False
+    def collidepolygon(self, polygon, mtv: bool=False):
+        """
+        Test if another Polygon object is colliding with the polygon, using the Separating Axis Theorem.
+        Arguments:
+            polygon: Polygon object
+            mtv: return the minimum translation vector instead of True
+        Returns:
+            True if they collide, otherwise False. If mtv is set, the vector [x, y]
+            that moves this polygon out of the other one, or None if no collision
+        """
+        return self.template.collide(self._center, polygon.template, polygon.center, self._angle, polygon.angle, mtv)
 
     def collideline_object(self, line):
         """
         Test if a line object is colliding with the polygon.
         """
         if self.rect.colliderect(line.rect):
-            for coord in line.coordinates:
-                if self.collidepoint(coord):
-                    return True
-        
             if self.collideline(line.boundary):
                 return True
 
+            if self.collidepoint(line.coordinates[0]):
+                return True
+
         return False
 
     def draw(self, surface, color, width=0):
@@ -456,19 +316,19 @@ class Polygon:
             color: color value, tuple
         """
 
-        pygame.draw.polygon(surface, color, self._coordinates, width)
+        return pygame.draw.polygon(surface, color, self.coordinates, width)
     
     def manual_draw(self, surface, color, width=0):
         """Draw an outline of the polygon"""
 
-        for i in range(len(self._coordinates)-1):
-            pygame.draw.line(surface, color, self._coordinates[i], self._coordinates[i+1], width)
+        for i in range(len(self.coordinates)-1):
+            pygame.draw.line(surface, color, self.coordinates[i], self.coordinates[i+1], width)
 
     def aadraw(self, surface, color):
         """Draw an anti-aliased outline of the polygon"""
 
-        for i in range(len(self._coordinates)-1):
-            pygame.draw.aaline(surface, color, self._coordinates[i], self._coordinates[i+1])
+        for i in range(len(self.coordinates)-1):
+            pygame.draw.aaline(surface, color, self.coordinates[i], self.coordinates[i+1])
 
     def move(self, x: float=0, y: float=0):
         """
@@ -478,14 +338,9 @@ class Polygon:
             y: magnitude of verticle movement
         """
 
-        self._coordinates = [[coord[0]+x, coord[1]+y] for coord in self._coordinates]
-
-        _x, _y = zip(*self._coordinates)
-        self.rect = pygame.Rect(min(_x), min(_y), max(_x)-min(_x)+1, max(_y)-min(_y)+1)
-        
         self._center[0] += x
         self._center[1] += y
-        self.create_boundaries()
+        self._dirty = True
 
         return self
 
@@ -497,16 +352,7 @@ class Polygon:
             y: magnitude of verticle movement
         """
 
-        self._coordinates = [[coord[0]+x, coord[1]+y] for coord in self._coordinates]
-
-        _x, _y = zip(*self._coordinates)
-        self.rect = pygame.Rect(min(_x), min(_y), max(_x)-min(_x)+1, max(_y)-min(_y)+1)
-        
-        self._center[0] += x
-        self._center[1] += y
-        self.create_boundaries()
-
-        return self
+        return self.move(x, y)
 
     def move_to(self, position: tuple):
         """
@@ -515,7 +361,7 @@ class Polygon:
             position: new coordinate to move to
         """
 
-        self.move_by(position[0]-self._center[0], position[1]-self._center[1])
+        self.center = position
         return self
 
     def rotate(self, angle, center: tuple=None):
@@ -526,61 +372,89 @@ class Polygon:
             center: point of rotation (x, y)
         """
 
-        if not center:
-            center = self._center
-        
-        angle = radians(angle)
-        for i in range(len(self._coordinates)):
-            self._coordinates[i] = [cos(angle)*(self._coordinates[i][0]-center[0]) - sin(angle)*(self._coordinates[i][1]-center[1]) + center[0], 
-                                    sin(angle)*(self._coordinates[i][0]-center[0]) + cos(angle)*(self._coordinates[i][1]-center[1]) + center[1]
-            ]
-
-        self.reorder_coords(self._coordinates)
-        self.create_center()
-        self.create_boundaries()
+        # A rigid rotation keeps the vertex order and the local vertices, only the transform changes
+        if center:
+            self._center = rotate_coord(self._center, angle, center)
+        self._angle = (self._angle + angle) % 360
+        self._dirty = True
 
         return self
 
     def enlarge(self, scale_factor=1, center=None):
-        if center == None: 
-            center = self._center
-
-        for i in range(len(self._coordinates)):
-            self._coordinates[i] = [scale_factor*(self._coordinates[i][0]-center[0]) + center[0], 
-                                    scale_factor*(self._coordinates[i][1]-center[1]) + center[1]
-            ]
+        if center is not None: 
+            self._center = enlarge_coord(self._center, scale_factor, center)
 
-        x, y = zip(*self._coordinates)
-        self.rect = pygame.Rect(min(x), min(y), max(x)-min(x)+1, max(y)-min(y)+1)
-        self.create_center()
-        self.create_boundaries()
+        self._local = [[scale_factor*i[0], scale_factor*i[1]] for i in self._local]
+        self._template = None
+        self._dirty = True
 
         return self
 
+    def copy(self, center: tuple=None, angle: float=None):
+        """
+        Returns a new Polygon with the same shape, without sorting or centering the vertices again.
+        The local vertices and the collision template are shared, not copied: they are
+        only ever replaced, never changed in place, so neither polygon can affect the other.
+        Arguments:
+            center: center of the copy, the same as this polygon's if None
+            angle: rotation of the copy in degrees, the same as this polygon's if None
+        """
+        polygon = Polygon.__new__(Polygon)
+        polygon._local = self._local
+        polygon._template = self._template
+        polygon._center = list(self._center if center is None else center)
+        polygon._angle = self._angle if angle is None else angle % 360
+        polygon._dirty = True
+        return polygon
+
     @property
     def coordinates(self):
+        if self._dirty:
+            self.update()
         return self._coordinates
     @coordinates.setter
     def coordinates(self, coordinates):
         self.reorder_coords(coordinates)
         self.create_center()
-        self.create_boundaries()
         return self
 
+    @property
+    def rect(self):
+        if self._dirty:
+            self.update()
+        return self._rect
+
+    @property
+    def boundaries(self):
+        if self._dirty:
+            self.update()
+        if self._boundaries is None:
+            self.create_boundaries()
+        return self._boundaries
+
+    @property
+    def template(self):
+        """The ShapeTemplate shared by every polygon with the same local vertices"""
+        if self._template is None:
+            self._template = get_template(self._local[:-1])
+        return self._template
+
+    @property
+    def angle(self):
+        return self._angle
+    @angle.setter
+    def angle(self, angle):
+        """Rotate the polygon to an absolute angle in degrees, around its center"""
+        self._angle = angle % 360
+        self._dirty = True
+
     @property
     def center(self):
         return self._center
     @center.setter
     def center(self, center):
-        vector = [center[0]-self._center[0], center[1]-self._center[1]]
-        for i in range(len(self._coordinates)):
-            self._coordinates[i] = [self._coordinates[i][0]+vector[0], self._coordinates[i][1]+vector[1]]
-
-        x, y = zip(*self._coordinates)
-        self.rect = pygame.Rect(min(x), min(y), max(x)-min(x)+1, max(y)-min(y)+1)
-        
         self._center = list(center)
-        self.create_boundaries()
+        self._dirty = True
 
 
 class Line:
@@ -607,53 +481,20 @@ class Line:
         ]
 
     def create_boundary(self):
-        """Generate the line's boundaries for collision testing"""
-
-        if self.coordinates[0][0] == self.coordinates[1][0]:
-            gradient = "x"
-            y_intercept = self.coordinates[0][0]
-
-        elif self.coordinates[0][1] == self.coordinates[1][1]:
-            gradient = "y"
-            y_intercept = self.coordinates[0][1]
-
-        else:
-            gradient = (self.coordinates[0][1]-self.coordinates[1][1]) / (self.coordinates[0][0]-self.coordinates[1][0])
-            y_intercept = self.coordinates[0][1] - (gradient*self.coordinates[0][0])
+        """Generate the line's boundary for collision testing, as the segment (x1, y1, x2, y2)"""
 
-        x, y = zip(*self._coordinates[0:2])
-
-        self.boundary = [gradient, y_intercept, "", (min(x), max(x)), (min(y), max(y))]
+        self.boundary = (self._coordinates[0][0], self._coordinates[0][1], self._coordinates[1][0], self._coordinates[1][1])
 
     def collidelines(self, lines):
         """
         Test if a line is colliding with the line.
         Arguments:
-            lines: a list of values used.
+            lines: array of segments, one (x1, y1, x2, y2) row per line
         Returns:
             True if intersection detected and False if not
         """
 
-        for line in lines:
-            if (self.boundary[0] == line[0]) and (self.boundary[1] == line[1]): 
-                return True
-            elif (self.boundary[0] == "x") and (line[0] == "y") and (self.boundary[4][0] <= line[1] <= self.boundary[4][1]) and (line[3][0] <= self.boundary[1] <= line[3][1]): 
-                return True
-            elif (self.boundary[0] == "y") and (line[0] == "x") and (self.boundary[3][0] <= line[1] <= self.boundary[3][1]) and (line[4][0] <= self.boundary[1] <= line[4][1]): 
-                return True
-
-            elif self.boundary[0] not in ["x", "y"]:
-                if (line[0] == "x") and (self.boundary[3][0] <= line[1] <= self.boundary[3][1]) and (line[4][0] <= (line[1]*self.boundary[0])+self.boundary[1] <= line[4][1]): 
-                    return True
-                elif (line[0] == "y") and (self.boundary[4][0] <= line[1] <= self.boundary[4][1]) and (line[3][0] <= (line[1]-self.boundary[1])/self.boundary[0] <= line[3][1]): 
-                    return True
-                elif line[0] not in ["x", "y"]:
-                    if self.boundary[0] == line[0]: 
-                        continue
-                    elif (self.boundary[3][0] <= (line[1]-self.boundary[1])/(self.boundary[0]-line[0]) <= self.boundary[3][1]) and (line[3][0] <= (line[1]-self.boundary[1])/(self.boundary[0]-line[0]) <= line[3][1]): 
-                        return True
-
-        return False
+        return bool(segments_intersect(self.boundary, lines).any())
 
     def colliderect(self, rect: pygame.Rect):
         """
@@ -664,53 +505,46 @@ class Line:
             True if collision detected and False if not
         """
 
-        rect_lines = [["y", rect.top, "", (rect.left, rect.right), (rect.top, rect.top)], 
-                    ["x", rect.right, "", (rect.right, rect.right), (rect.top, rect.bottom)], 
-                    ["y", rect.bottom, "", (rect.left, rect.right), (rect.bottom, rect.bottom)], 
-                    ["x", rect.left, "", (rect.left, rect.left), (rect.top, rect.bottom)]
-        ]
-
         if self.rect.colliderect(rect):
-            for coord in self._coordinates:
-                if rect.collidepoint(coord):
-                    return True
+            if rect.collidepoint(self._coordinates[0]):
+                return True
 
-            if self.collidelines(rect_lines):
+            if self.collidelines(rect_to_segments(rect)):
                 return True
         
         return False
 
     def collidecircle(self, circle):
         if self.rect.colliderect(circle.rect):
-            for coord in self._coordinates:
-                if circle.collidepoint(coord):
-                    return True
-
             if circle.collideline(self.boundary):
                 return True
         
         return False
 
-    def collidepolygon(self, polygon):
-        if self.rect.colliderect(polygon.rect):
-            for coord in self._coordinates:
-                if polygon.collidepoint(coord):
-                    return True
-        
-            if self.collidelines(polygon.boundaries):
-                return True
-
-        return False
+    def collidepolygon(self, polygon, mtv: bool=False):
+        """
+        Test if a Polygon object is colliding with the line, using the Separating Axis Theorem.
+        Arguments:
+            polygon: Polygon object
+            mtv: return the minimum translation vector instead of True
+        Returns:
+            True if they collide, otherwise False. If mtv is set, the vector [x, y]
+            that moves the line out of the polygon, or None if no collision
+        """
+        (x1, y1), (x2, y2) = self._coordinates[0], self._coordinates[1]
+        length = sqrt((x2-x1)**2 + (y2-y1)**2) or 1
+        axis = [(y1-y2)/length, (x2-x1)/length]
+        return polygon.template.collide_points(self._coordinates[:2], axis, polygon.center, polygon.angle, mtv)
     
     def draw(self, surface, color):
         """Draw an outline of the polygon"""
 
-        pygame.draw.line(surface, color, self._coordinates[0], self._coordinates[1])
+        return pygame.draw.line(surface, color, self._coordinates[0], self._coordinates[1])
 
     def aadraw(self, surface, color):
         """Draw an anti-aliased outline of the polygon"""
 
-        pygame.draw.aaline(surface, color, self._coordinates[0], self._coordinates[1])
+        return pygame.draw.aaline(surface, color, self._coordinates[0], self._coordinates[1])
 
     def move(self, x: float=0, y: float=0):
         """
@@ -769,10 +603,10 @@ class Line:
         if not center:
             center = self.center
         
-        angle = radians(angle)
+        s, c = sincos(angle)
         for i in range(len(self._coordinates)):
-            self._coordinates[i] = [cos(angle) * (self._coordinates[i][0] - center[0]) - sin(angle) * (self._coordinates[i][1] - center[1]) + center[0], 
-                                    sin(angle) * (self._coordinates[i][0] - center[0]) + cos(angle) * (self._coordinates[i][1] - center[1]) + center[1]
+            self._coordinates[i] = [c * (self._coordinates[i][0] - center[0]) - s * (self._coordinates[i][1] - center[1]) + center[0], 
+                                    s * (self._coordinates[i][0] - center[0]) + c * (self._coordinates[i][1] - center[1]) + center[1]
             ]
 
         self.reorder_coords(self._coordinates)
@@ -804,6 +638,197 @@ class Line:
         self.reorder_coords(coordinates)
         self.create_center()
 
+class ShapeTemplate:
+    def __init__(self, vertices: list):
+        """
+        Creates a ShapeTemplate, the collision geometry shared by every shape with the same vertices.
+        The vertices are split into convex pieces and each piece's edge normals are found once,
+        so Separating Axis tests only have to offset the stored projections by the shape's position.
+        Arguments:
+            vertices: list of coordinates relative to the shape's center, not closed
+        """
+        self.vertices = np.asarray(vertices, dtype=float)
+        self.radius = float(np.sqrt((self.vertices**2).sum(axis=1)).max())
+        self.pieces = [self.vertices[piece] for piece in convex_decompose(self.vertices.tolist())]
+        self.axes = [edge_normals(piece) for piece in self.pieces]
+        # Other template -> {(piece, other piece): projections on both sets of axes}, dropped with the other template
+        self._projections = weakref.WeakKeyDictionary()
+
+    def projections(self, other, i, j):
+        """
+        Returns the unrotated projections of this template's piece i and the other template's piece j
+        onto the axes of both pieces. Cached, since they do not change under translation.
+        """
+        projections = self._projections.get(other)
+        if projections is None:
+            projections = self._projections[other] = {}
+        if (i, j) not in projections:
+            axes = np.vstack((self.axes[i], other.axes[j]))
+            own = self.pieces[i] @ axes.T
+            others = other.pieces[j] @ axes.T
+            projections[(i, j)] = (axes, own.min(axis=0), own.max(axis=0), others.min(axis=0), others.max(axis=0))
+        return projections[(i, j)]
+
+    def collide(self, position, other, other_position, angle: float=0, other_angle: float=0, mtv: bool=False):
+        """
+        Test if two placed templates overlap using the Separating Axis Theorem.
+        Arguments:
+            position: center of this shape, (x, y)
+            other: ShapeTemplate of the other shape
+            other_position: center of the other shape, (x, y)
+            angle: rotation of this shape in degrees
+            other_angle: rotation of the other shape in degrees
+            mtv: return the minimum translation vector instead of True
+        Returns:
+            True if the shapes overlap, otherwise False. If mtv is set, the vector [x, y]
+            that moves this shape out of the other one, or None if they are apart
+        """
+        offset = [other_position[0]-position[0], other_position[1]-position[1]]
+        if offset[0]**2 + offset[1]**2 > (self.radius+other.radius)**2:
+            return None if mtv else False
+
+        # Work in this shape's frame, where only the other shape can be rotated
+        if angle:
+            offset = rotate_coord(offset, -angle)
+        relative_angle = (other_angle-angle) % 360
+        if relative_angle:
+            rotation = rotation_matrix(relative_angle)
+
+        pairs = []
+        for i in range(len(self.pieces)):
+            for j in range(len(other.pieces)):
+                if relative_angle:
+                    piece = other.pieces[j] @ rotation.T
+                    axes = np.vstack((self.axes[i], other.axes[j] @ rotation.T))
+                    own, others = self.pieces[i] @ axes.T, piece @ axes.T
+                    own_min, own_max, other_min, other_max = own.min(axis=0), own.max(axis=0), others.min(axis=0), others.max(axis=0)
+                else:
+                    axes, own_min, own_max, other_min, other_max = self.projections(other, i, j)
+                shift = axes @ offset
+                # Distance this shape has to move backwards or forwards along each axis to separate
+                backwards, forwards = own_max - (other_min+shift), (other_max+shift) - own_min
+                if mtv:
+                    pairs.append((axes, backwards, forwards))
+                elif (np.minimum(backwards, forwards) >= 0).all():
+                    return True
+
+        if not mtv:
+            return False
+        # The pieces are solved together, one piece pair's own vector can leave another pair overlapping
+        vector = separating_translation(pairs)
+        if vector is None:
+            return None
+        if angle:
+            vector = rotate_coord(vector, angle)
+        return [float(vector[0]), float(vector[1])]
+
+    def collide_points(self, points, axes, position, angle: float=0, mtv: bool=False):
+        """
+        Test a convex set of world coordinates, such as the end points of a line, against this template.
+        Arguments:
+            points: list of coordinates
+            axes: unit normals of the edges between the points
+            position: center of this shape, (x, y)
+            angle: rotation of this shape in degrees
+            mtv: return the minimum translation vector instead of True
+        Returns:
+            True if they overlap, otherwise False. If mtv is set, the vector [x, y]
+            that moves the points out of the shape, or None if they are apart
+        """
+        points = np.asarray(points, dtype=float) - position
+        axes = np.asarray(axes, dtype=float).reshape(-1, 2)
+        if angle:
+            rotation = rotation_matrix(-angle)
+            points, axes = points @ rotation.T, axes @ rotation.T
+
+        pairs = []
+        for i in range(len(self.pieces)):
+            all_axes = np.vstack((self.axes[i], axes))
+            own, others = self.pieces[i] @ all_axes.T, points @ all_axes.T
+            own_min, own_max, other_min, other_max = own.min(axis=0), own.max(axis=0), others.min(axis=0), others.max(axis=0)
+            # Distance the points have to move backwards or forwards along each axis to separate
+            backwards, forwards = other_max - own_min, own_max - other_min
+            if mtv:
+                pairs.append((all_axes, backwards, forwards))
+            elif (np.minimum(backwards, forwards) >= 0).all():
+                return True
+
+        if not mtv:
+            return False
+        vector = separating_translation(pairs)
+        if vector is None:
+            return None
+        if angle:
+            vector = rotate_coord(vector, angle)
+        return [float(vector[0]), float(vector[1])]
+
+
+TEMPLATES = OrderedDict()  # Rounded vertices -> ShapeTemplate, least recently used first
+TEMPLATE_CAPACITY = 256
+
+def get_template(vertices: list):
+    """
+    Returns the ShapeTemplate for a list of vertices relative to a shape's center,
+    building it the first time those vertices are seen. Only the most recently used
+    templates are kept, shapes hold on to their own template anyway.
+    """
+    key = tuple((round(i[0], 6), round(i[1], 6)) for i in vertices)
+    template = TEMPLATES.get(key)
+    if template is None:
+        template = TEMPLATES[key] = ShapeTemplate(vertices)
+        if len(TEMPLATES) > TEMPLATE_CAPACITY:
+            TEMPLATES.popitem(last=False)
+    else:
+        TEMPLATES.move_to_end(key)
+    return template
+
+class RotationTable:
+    def __init__(self, step: float=1):
+        """
+        Creates a RotationTable, the sines, cosines and rotation matrices of every
+        multiple of step degrees in a full turn. Other angles are computed exactly.
+        Arguments:
+            step: spacing of the table's angles in degrees, must divide 360
+        """
+        self.step = step
+        self.size = round(360/step)
+        # Built with math.sin/cos, so a table entry is the same float an exact calculation gives
+        self.sines = [sin(radians(i*step)) for i in range(self.size)]
+        self.cosines = [cos(radians(i*step)) for i in range(self.size)]
+        self.matrices = np.array([[[c, -s], [s, c]] for s, c in zip(self.sines, self.cosines)])
+        self.matrices.flags.writeable = False
+
+    def index(self, angle: float):
+        """Returns the table row of an angle, or None if the angle is not in the table"""
+        i = angle/self.step
+        rounded = round(i)
+        if -1e-9 < i - rounded < 1e-9:
+            return rounded % self.size
+        return None
+
+    def sincos(self, angle: float):
+        """Returns (sin, cos) of an angle in degrees"""
+        # Same as index(), inlined since this is called for every rotation
+        i = angle/self.step
+        rounded = round(i)
+        if -1e-9 < i - rounded < 1e-9:
+            rounded %= self.size
+            return self.sines[rounded], self.cosines[rounded]
+        angle = radians(angle)
+        return sin(angle), cos(angle)
+
+    def matrix(self, angle: float):
+        """Returns the 2x2 rotation matrix of an angle in degrees"""
+        i = self.index(angle)
+        if i is None:
+            s, c = sin(radians(angle)), cos(radians(angle))
+            return np.array([[c, -s], [s, c]])
+        return self.matrices[i]
+
+
+# Whole degrees cover the ship's turning steps, its death spin and the asteroids' angles
+ROTATIONS = RotationTable(1)
+
 def rotate_coord(coord, angle, center: tuple=None):
     """
     Roate the coordinate around a point.
@@ -817,9 +842,9 @@ def rotate_coord(coord, angle, center: tuple=None):
 
     if not center:
         center = (0, 0)
-    angle = radians(angle)
-    coord = [cos(angle) * (coord[0] - center[0]) - sin(angle) * (coord[1] - center[1]) + center[0], 
-            sin(angle) * (coord[0] - center[0]) + cos(angle) * (coord[1] - center[1]) + center[1]
+    s, c = sincos(angle)
+    coord = [c * (coord[0] - center[0]) - s * (coord[1] - center[1]) + center[0], 
+            s * (coord[0] - center[0]) + c * (coord[1] - center[1]) + center[1]
     ]
 
     return coord
@@ -853,4 +878,267 @@ def enlarge_coord(coord: list, scale_factor: float=1, center=(0, 0)):
     """
     Perform an enlargement function to a coordinate
     """
-    return [scale_factor*(coord[0]-center[0]) + center[0], scale_factor*(coord[1]-center[1]) + center[1]]
\ No newline at end of file
+    return [scale_factor*(coord[0]-center[0]) + center[0], scale_factor*(coord[1]-center[1]) + center[1]]
+
+def coords_to_segments(coordinates: list):
+    """
+    Returns the edges of a closed list of coordinates as an array of segments,
+    one (x1, y1, x2, y2) row per edge
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    return np.hstack((coordinates[:-1], coordinates[1:]))
+
+def rect_to_segments(rect: pygame.Rect):
+    """
+    Returns the four sides of a pygame.Rect object as an array of segments
+    """
+    return coords_to_segments([rect.topleft, rect.topright, rect.bottomright, rect.bottomleft, rect.topleft])
+
+def segments_intersect(segments_a, segments_b):
+    """
+    Test every segment of one set against every segment of another.
+    Uses the signs of cross products, so no gradients are divided and vertical
+    or collinear segments need no special cases.
+    Arguments:
+        segments_a: (x1, y1, x2, y2) or an array of shape (n, 4)
+        segments_b: (x1, y1, x2, y2) or an array of shape (m, 4)
+    Returns:
+        bool array of shape (n, m), True where two segments touch
+    """
+    a = np.asarray(segments_a, dtype=float).reshape(-1, 1, 4)
+    b = np.asarray(segments_b, dtype=float).reshape(1, -1, 4)
+    ax, ay, bx, by = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    cx, cy, dx, dy = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    # Which side of each segment the end points of the other segment lie on
+    side_c = (bx-ax)*(cy-ay) - (by-ay)*(cx-ax)
+    side_d = (bx-ax)*(dy-ay) - (by-ay)*(dx-ax)
+    side_a = (dx-cx)*(ay-cy) - (dy-cy)*(ax-cx)
+    side_b = (dx-cx)*(by-cy) - (dy-cy)*(bx-cx)
+
+    # The bounding boxes must overlap as well, which settles the collinear case
+    overlap = ((np.minimum(ax, bx) <= np.maximum(cx, dx)) & (np.minimum(cx, dx) <= np.maximum(ax, bx)) & 
+                (np.minimum(ay, by) <= np.maximum(cy, dy)) & (np.minimum(cy, dy) <= np.maximum(ay, by)))
+
+    return (side_c*side_d <= 0) & (side_a*side_b <= 0) & overlap
+
+def segments_circle(segments, centers, radii):
+    """
+    Test every segment against every circle.
+    Arguments:
+        segments: (x1, y1, x2, y2) or an array of shape (n, 4)
+        centers: (x, y) or an array of shape (m, 2)
+        radii: a radius or an array of shape (m,)
+    Returns:
+        bool array of shape (n, m), True where a segment passes within a circle
+    """
+    segments = np.asarray(segments, dtype=float).reshape(-1, 1, 4)
+    centers = np.asarray(centers, dtype=float).reshape(1, -1, 2)
+    radii = np.asarray(radii, dtype=float).reshape(1, -1)
+
+    start, direction = segments[..., :2], segments[..., 2:] - segments[..., :2]
+    offset = centers - start
+    length = (direction**2).sum(axis=2)
+
+    # Parameter of the point on each segment closest to the circle's center, clamped to the segment
+    t = np.clip((offset*direction).sum(axis=2) / np.where(length > 0, length, 1), 0, 1)
+    closest = start + t[..., None]*direction
+    return ((closest - centers)**2).sum(axis=2) <= radii**2
+
+def points_in_segments(segments, points, inside: tuple):
+    """
+    Test if points are inside a convex polygon given by its edges.
+    A point is inside when it is on the same side of every edge as a known interior point.
+    Arguments:
+        segments: array of shape (n, 4) of the polygon's edges
+        points: array of shape (m, 2)
+        inside: a point inside the polygon, (x, y)
+    Returns:
+        bool array of shape (m,)
+    """
+    segments = np.asarray(segments, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, 1, 2)
+    start, direction = segments[:, :2], segments[:, 2:] - segments[:, :2]
+
+    reference = direction[:, 0]*(inside[1]-start[:, 1]) - direction[:, 1]*(inside[0]-start[:, 0])
+    side = direction[:, 0]*(points[..., 1]-start[:, 1]) - direction[:, 1]*(points[..., 0]-start[:, 0])
+    return (side*reference >= 0).all(axis=1)
+
+def separating_translation(pairs):
+    """
+    Find the shortest translation that leaves no pair of convex pieces overlapping.
+    Moving by a vector v adds axes @ v to a pair's backwards depths and takes it from its
+    forwards depths, and the pair overlaps while every depth is at least 0. Along one direction
+    a pair overlaps over a single interval of distances, so the first distance past every
+    interval met is free. Each axis of the overlapping pairs is tried both ways. A single pair is
+    convex, so its shallowest axis is the answer, as in the plain Separating Axis Theorem.
+    Arguments:
+        pairs: list of (axes, backwards, forwards), arrays of shape (n, 2), (n,) and (n,), one per piece pair
+    Returns:
+        numpy array [x, y], or None if no pair overlaps
+    """
+    overlapping = [pair for pair in pairs if (np.minimum(pair[1], pair[2]) >= 0).all()]
+    if not overlapping:
+        return None
+    if len(pairs) == 1:
+        axes, backwards, forwards = pairs[0]
+        depth = np.minimum(backwards, forwards)
+        k = int(depth.argmin())
+        return axes[k]*(-backwards[k] if backwards[k] < forwards[k] else forwards[k])
+    # Pairs share the axes of their pieces, so many directions repeat
+    directions = np.unique(np.vstack([axes for axes, backwards, forwards in overlapping]).round(9), axis=0)
+    directions = np.vstack((directions, -directions))
+
+    # More pairs can only push a direction's distance further, so the overlapping pairs alone give
+    # lower bounds, and only the best direction so far is checked against every pair
+    distances = _escape_distances(directions, overlapping)
+    exact = np.zeros(len(directions), dtype=bool)
+    while True:
+        best = int(distances.argmin())
+        if exact[best]:
+            return directions[best]*distances[best]
+        distances[best] = _escape_distances(directions[best:best+1], pairs)[0]
+        exact[best] = True
+
+def _escape_distances(directions, pairs):
+    """Returns how far to move along each direction before no pair of pieces overlaps, see separating_translation"""
+    # Every depth as a constraint depth + t*slope >= 0 on the distance t moved along a direction
+    normals = np.vstack([np.vstack((axes, -axes)) for axes, backwards, forwards in pairs])
+    depths = np.concatenate([np.concatenate((backwards, forwards)) for axes, backwards, forwards in pairs])
+    starts = np.cumsum([0] + [2*len(axes) for axes, backwards, forwards in pairs[:-1]])
+    slopes = directions @ normals.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bounds = -depths / slopes
+    lower = np.where(slopes > 0, bounds, np.where((slopes == 0) & (depths < 0), np.inf, -np.inf))
+    upper = np.where(slopes < 0, bounds, np.inf)
+    low = np.maximum.reduceat(lower, starts, axis=1)
+    high = np.minimum.reduceat(upper, starts, axis=1)
+
+    # Skip each direction to the furthest end of the intervals it is in, until it is in none
+    distances = np.zeros(len(directions))
+    while True:
+        inside = (low <= distances[:, None]) & (high > distances[:, None])
+        if not inside.any():
+            return distances
+        distances = np.maximum(distances, np.where(inside, high, -np.inf).max(axis=1))
+
+def rotation_matrix(angle: float):
+    """
+    Returns the 2x2 matrix that rotates a column vector by an angle in degrees.
+    Angles in the rotation table share a read-only precomputed matrix.
+    """
+    return ROTATIONS.matrix(angle)
+
+# Returns (sin, cos) of an angle in degrees, from the rotation table when it holds the angle
+sincos = ROTATIONS.sincos
+
+def rotate_points(coordinates, angle: float, center: tuple=None):
+    """
+    Rotate a whole array of coordinates with a single matrix product.
+    Arguments:
+        coordinates: array of shape (n, 2)
+        angle: in degrees
+        center: point of rotation, (x, y), the origin if None
+    Returns:
+        numpy array of shape (n, 2) of the rotated coordinates
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    if center is None:
+        return coordinates @ ROTATIONS.matrix(angle).T
+    return (coordinates - center) @ ROTATIONS.matrix(angle).T + center
+
+def edge_normals(vertices):
+    """
+    Returns the unit normals of the edges of a closed ring of vertices, one row per edge.
+    Parallel edges share an axis, so duplicates are removed.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    edges = np.roll(vertices, -1, axis=0) - vertices
+    normals = np.column_stack((-edges[:, 1], edges[:, 0]))
+    lengths = np.sqrt((normals**2).sum(axis=1))
+    normals = normals[lengths > 0] / lengths[lengths > 0, None]
+
+    unique = []
+    for normal in normals:
+        if not any(abs(normal[0]*other[1] - normal[1]*other[0]) < 1e-9 for other in unique):
+            unique.append(normal)
+    return np.array(unique)
+
+def _cross(o, a, b):
+    return (a[0]-o[0])*(b[1]-o[1]) - (a[1]-o[1])*(b[0]-o[0])
+
+def is_convex(vertices: list):
+    """
+    Test if a ring of vertices (not closed) forms a convex polygon
+    """
+    signs = set()
+    for i in range(len(vertices)):
+        turn = _cross(vertices[i-2], vertices[i-1], vertices[i])
+        if turn:
+            signs.add(turn > 0)
+    return len(signs) <= 1
+
+def convex_decompose(vertices: list):
+    """
+    Split a simple polygon into convex pieces by ear clipping it into triangles
+    and then merging neighbouring pieces while the result stays convex.
+    Arguments:
+        vertices: ring of coordinates, not closed
+    Returns:
+        list of pieces, each a list of indices into vertices
+    """
+    indices = list(range(len(vertices)))
+    if len(vertices) < 4 or is_convex(vertices):
+        return [indices]
+
+    area = sum(_cross((0, 0), vertices[i-1], vertices[i]) for i in indices)
+    orientation = 1 if area > 0 else -1
+
+    # Ear clipping
+    triangles = []
+    remaining = indices[:]
+    while len(remaining) > 3:
+        for k in range(len(remaining)):
+            a, b, c = remaining[k-1], remaining[k], remaining[(k+1) % len(remaining)]
+            if _cross(vertices[a], vertices[b], vertices[c])*orientation <= 0:
+                continue
+            if any(_cross(vertices[a], vertices[b], vertices[p])*orientation >= 0 and 
+                    _cross(vertices[b], vertices[c], vertices[p])*orientation >= 0 and 
+                    _cross(vertices[c], vertices[a], vertices[p])*orientation >= 0 
+                    for p in remaining if p not in (a, b, c)):
+                continue
+            triangles.append([a, b, c])
+            remaining.pop(k)
+            break
+        else:
+            break  # Not a simple polygon, keep what is left as one piece
+    pieces = triangles + [remaining]
+
+    # Merge pieces across shared diagonals while they stay convex
+    merged = True
+    while merged:
+        merged = False
+        for p in range(len(pieces)):
+            for q in range(p+1, len(pieces)):
+                piece = _merge(pieces[p], pieces[q])
+                if piece and is_convex([vertices[i] for i in piece]):
+                    pieces[p] = piece
+                    pieces.pop(q)
+                    merged = True
+                    break
+            if merged:
+                break
+
+    return pieces
+
+def _merge(first: list, second: list):
+    """Join two pieces that share an edge, or return None if they do not"""
+    for k in range(len(first)):
+        a, b = first[k], first[(k+1) % len(first)]
+        if a in second and second[(second.index(a)-1) % len(second)] == b:
+            start = (k+1) % len(first)
+            ring = first[start:] + first[:start]  # b ... a
+            j = second.index(a)
+            inner = (second[j+1:] + second[:j])[:-1]  # between a and b in the second piece
+            return ring + inner
+    return None
@@ -0,0 +1,79 @@
+"""
+Module containing the game simulation without any rendering or input handling.
+Used by the game itself and by the headless runner.
+"""
+
+from assets.sprites import Player, Bullets, Asteroids
+from assets.rng import RandomStreams
+
+class Simulation:
+    def __init__(self, width: int=650, height: int=650, seed: int=None):
+        """
+        Creates a Simulation of one game.
+        The same seed and the same inputs always play out the same game.
+        Arguments:
+            width, height: size of the playing field
+            seed: seed of the random streams, a random one is picked if None
+        """
+        self.width, self.height = width, height
+        self.streams = RandomStreams(seed)
+        self.profiler = None  # Profiler timing the phases of each tick, see assets/profiler.py
+        self.reset()
+
+    @property
+    def seed(self):
+        return self.streams.seed
+
+    def reset(self):
+        """Start a new game"""
+        self.player = Player(self.width, self.height, self.streams["player"])
+        self.bullets = Bullets(self.width, self.height)
+        self.asteroids = Asteroids(self.width, self.height, self.streams["asteroids"], self.streams["particles"]).next_round()
+        self.score = 0
+        self.game_over = False  # Set once the last life is lost
+
+        self.shake = False
+        self.shake_timer = 0
+        self.ticks = 0
+
+    @property
+    def finished(self):
+        """Whether the game is over and the death animation has played out"""
+        return self.game_over and not self.player.dead
+
+    def tick(self, move: bool=False, fire: bool=False, keys=None):
+        """
+        Advance the game by one fixed tick.
+        Arguments:
+            move: whether the thrust key is held
+            fire: whether the fire key is held
+            keys: key state for steering indexed by key constant, read from the keyboard if None
+        """
+        if not len(self.asteroids.asteroids):
+            self.asteroids.asteroid_no += 1
+            if self.asteroids.asteroid_no > 6:
+                self.asteroids.asteroid_no = 6
+            self.asteroids.next_round()
+
+        profiler = self.profiler
+        self.shake = False
+        if self.player.dead:
+            health, end = self.player.death()
+            if end:
+                self.player = Player(self.width, self.height, self.streams["player"])
+                self.player.health = health
+                self.player.safe = True
+                self.player.timer = 300
+        else: self.player.move(move, keys)
+        if profiler: profiler.lap("player")
+        self.score, self.shake = self.asteroids.move(self.player, self.bullets, self.score, self.shake)
+        self.game_over = not self.player.health
+        if profiler: profiler.lap("asteroids")
+        self.bullets.bullet_handler(self.player, fire)
+        if profiler: profiler.lap("bullets")
+
+        if self.shake:
+            self.shake_timer = 15
+        elif self.shake_timer:
+            self.shake_timer -= 1
+        self.ticks += 1
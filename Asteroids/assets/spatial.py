@@ -0,0 +1,124 @@
+"""
+Module containing a uniform grid spatial hash.
+Used as a broadphase so that the exact collision tests in shapes.py only run
+for objects that share a grid cell.
+"""
+
+import numpy as np
+
+class SpatialHash:
+    def __init__(self, width: int, height: int, cell_size: int=64):
+        """
+        Creates a SpatialHash covering the play area.
+        The grid wraps around like the screen does, so objects that have moved
+        past an edge (before being wrapped to the other side) still hash into
+        valid cells. This can only add candidate pairs, never lose any.
+        Arguments:
+            width: width of the play area
+            height: height of the play area
+            cell_size: side length of a grid cell
+        """
+        self.cell_size = cell_size
+        self.columns = max(1, -(-width//cell_size))
+        self.rows = max(1, -(-height//cell_size))
+
+        self.layers = {}  # layer -> {cell: [keys]}
+        self.counts = {}  # layer -> number of registered objects
+        self.pair_counts = {}  # (layer_a, layer_b) -> [candidate pairs, all possible pairs]
+
+    def clear(self):
+        """Remove every object, ready for the next frame"""
+        self.layers = {}
+        self.counts = {}
+        self.pair_counts = {}
+
+    def cells(self, position, radius):
+        """
+        Returns the cells covered by a circle's bounding box.
+        Arguments:
+            position: center of the circle, (x, y)
+            radius: radius of the circle
+        """
+        first_column, last_column = int((position[0]-radius)//self.cell_size), int((position[0]+radius)//self.cell_size)
+        first_row, last_row = int((position[1]-radius)//self.cell_size), int((position[1]+radius)//self.cell_size)
+        return self._wrap(first_column, last_column, first_row, last_row)
+
+    def _wrap(self, first_column, last_column, first_row, last_row):
+        columns = [i % self.columns for i in range(first_column, min(last_column, first_column+self.columns-1)+1)]
+        rows = [j % self.rows for j in range(first_row, min(last_row, first_row+self.rows-1)+1)]
+        return [row*self.columns + column for row in rows for column in columns]
+
+    def insert(self, layer, key, position, radius: float=0):
+        """
+        Register an object in a layer.
+        Arguments:
+            layer: name of the group the object belongs to
+            key: value reported back in candidate pairs
+            position: center of the object, (x, y)
+            radius: bounding radius of the object
+        """
+        grid = self.layers.setdefault(layer, {})
+        for cell in self.cells(position, radius):
+            grid.setdefault(cell, []).append(key)
+        self.counts[layer] = self.counts.get(layer, 0) + 1
+
+    def insert_many(self, layer, positions, radii):
+        """
+        Register a batch of objects in a layer, keyed by their row index.
+        Arguments:
+            layer: name of the group the objects belong to
+            positions: array of shape (n, 2)
+            radii: array of shape (n,) or a single radius for all objects
+        """
+        grid = self.layers.setdefault(layer, {})
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        radii = np.broadcast_to(np.asarray(radii, dtype=float), (len(positions),))
+
+        low = np.floor_divide(positions - radii[:, None], self.cell_size).astype(int)
+        high = np.floor_divide(positions + radii[:, None], self.cell_size).astype(int)
+        for key, (first_column, first_row), (last_column, last_row) in zip(range(len(positions)), low.tolist(), high.tolist()):
+            if first_column == last_column and first_row == last_row:
+                cell = (first_row % self.rows)*self.columns + first_column % self.columns
+                grid.setdefault(cell, []).append(key)
+                continue
+            for cell in self._wrap(first_column, last_column, first_row, last_row):
+                grid.setdefault(cell, []).append(key)
+        self.counts[layer] = self.counts.get(layer, 0) + len(positions)
+
+    def pairs(self, layer_a, layer_b):
+        """
+        Find every pair of objects from two layers that share at least one cell.
+        Arguments:
+            layer_a: name of the first layer
+            layer_b: name of the second layer
+        Returns:
+            dict mapping each key of layer_a to the set of layer_b keys it may collide with
+        """
+        grid_a = self.layers.get(layer_a, {})
+        grid_b = self.layers.get(layer_b, {})
+        if len(grid_b) < len(grid_a):
+            shared = [cell for cell in grid_b if cell in grid_a]
+        else:
+            shared = [cell for cell in grid_a if cell in grid_b]
+
+        candidates = {}
+        for cell in shared:
+            keys_b = grid_b[cell]
+            for key in grid_a[cell]:
+                candidates.setdefault(key, set()).update(keys_b)
+
+        self.pair_counts[(layer_a, layer_b)] = [sum(len(keys) for keys in candidates.values()), 
+                                                self.counts.get(layer_a, 0)*self.counts.get(layer_b, 0)]
+        return candidates
+
+    def stats(self):
+        """
+        Returns the object counts and the pair counts of the pairs() calls made
+        since the last clear(), so the pruning can be compared against testing every pair.
+        """
+        return {
+            "objects": dict(self.counts),
+            "cells": sum(len(grid) for grid in self.layers.values()),
+            "candidate_pairs": sum(counts[0] for counts in self.pair_counts.values()),
+            "brute_force_pairs": sum(counts[1] for counts in self.pair_counts.values())
+        }
@@ -1,25 +1,42 @@
-from numpy import angle
+import numpy as np
 import pygame
 from pygame.locals import *
 
-from math import cos, sin, radians
+from math import sqrt
 import random
 
 from assets.shapes import *
-
-pygame.mixer.init()
+from assets.spatial import SpatialHash
+from assets.particles import Particles
+from assets.cache import SPRITES
+from assets.timing import interpolate
+from assets.loader import ASSETS
+from assets.audio import AUDIO
+from assets.prefabs import ASTEROID_SHAPES, get_prefab
 
 class Player:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None):
+        """
+        Creates the Player's ship as a rigid body: one outline in local space around the
+        ship's center, placed in the world by a position and an angle. World coordinates
+        are only worked out when drawing or testing collisions asks for them.
+        """
         self.width, self.height = width, height
+        self.rng = rng or random
 
         self.center = list(coords_to_rect([[width/2, height/2-50], [width/2-25, height/2+20], [width/2+25, height/2+20]]).center)
-        self.body = [
-            Line([[width/2, height/2-50], [width/2-25, height/2+20]]).enlarge(0.6, self.center),  # Left line
-            Line([[width/2, height/2-50], [width/2+25, height/2+20]]).enlarge(0.6, self.center),  # Right line
-            Line([[width/2-20, height/2+4], [width/2+20, height/2+4]]).enlarge(0.6, self.center)  # Center line
+        self.previous = self.center[:]  # Center before the last tick, for interpolated drawing
+        outline = [
+            [[width/2, height/2-50], [width/2-25, height/2+20]],  # Left line
+            [[width/2, height/2-50], [width/2+25, height/2+20]],  # Right line
+            [[width/2-20, height/2+4], [width/2+20, height/2+4]]  # Center line
         ]
-        self.top = enlarge_coord([width/2, height/2-50], 0.6, self.center)
+        # Ship outline relative to its center while facing up, one pair of end points per line
+        self.LINES = [[self.to_local(enlarge_coord(coord, 0.6, self.center)) for coord in line] for line in outline]
+        self.TOP = self.to_local(enlarge_coord([width/2, height/2-50], 0.6, self.center))
+        self.RADIUS = max(sqrt(x**2 + y**2) for line in self.LINES for x, y in line)
+        # Collision triangle of the ship around its center, while the ship faces up
+        self.HULL = get_template([self.TOP, self.LINES[0][1], self.LINES[1][1]])
 
         self.angle = 0
         self.ROTATION = 4
@@ -34,18 +51,27 @@ class Player:
         self.visible = True
 
         self.health = 3
-        self.HEALTH_IMG = pygame.image.load("assets/images/health bar.png")
-        self.HEALTH_IMG.set_colorkey((0, 0, 0))
         self.dead = False
         self.death_timer = 180
         self.movements = [[-0.5, -0.5], [0.5, -0.5], [0, 0.5]]
+        # While dying each line drifts away and spins around its own midpoint
+        self.drifts = [[0, 0] for line in self.LINES]
+        self.spins = [0 for line in self.LINES]
+
+        self._lines = None
+        self._key = None
+
+    def to_local(self, coord):
+        return [coord[0]-self.center[0], coord[1]-self.center[1]]
 
     def death(self):
+        self.previous = self.center[:]  # The wreck drifts by its lines, the center stays put
         if self.death_timer == 180:
-            self.angles = [random.choice([-3, 3]), random.choice([-3, 3]), random.choice([-3, 3])]
-        for i, line in enumerate(self.body):
-            line.move(self.movements[i][0], self.movements[i][1])
-            line.rotate(self.angles[i])
+            self.angles = [self.rng.choice([-3, 3]), self.rng.choice([-3, 3]), self.rng.choice([-3, 3])]
+        for i in range(len(self.LINES)):
+            self.drifts[i][0] += self.movements[i][0]
+            self.drifts[i][1] += self.movements[i][1]
+            self.spins[i] = (self.spins[i] + self.angles[i]) % 360
         self.death_timer -= 1
         if not self.death_timer:
             self.dead = False
@@ -53,22 +79,27 @@ class Player:
             return self.health, True
         return self.health, False
     
-    def move(self, move):
-        keys = pygame.key.get_pressed()
+    def move(self, move, keys=None):
+        """
+        Steer and move the ship for one tick.
+        Arguments:
+            move: whether the thrust key is held
+            keys: key state indexed by key constant, read from the keyboard if None
+        """
+        self.previous = self.center[:]
+        if keys is None:
+            keys = pygame.key.get_pressed()
         if keys[K_LEFT]:
             self.angle -= self.ROTATION
             if self.angle < 0:
                 self.angle += 360
-            for line in self.body: line.rotate(-self.ROTATION, self.center)
-            self.top = rotate_coord(self.top, -self.ROTATION, self.center)
         if keys[K_RIGHT]:
             self.angle += self.ROTATION
             if self.angle >= 360:
                 self.angle -= 360
-            for line in self.body: line.rotate(self.ROTATION, self.center)
-            self.top = rotate_coord(self.top, self.ROTATION, self.center)
         
-        self.max_vel = [self.VEL*sin(radians(self.angle)), -self.VEL*cos(radians(self.angle))]
+        s, c = sincos(self.angle)
+        self.max_vel = [self.VEL*s, -self.VEL*c]
         self.direction[0] = 1 if (0 < self.angle < 180) else -1
         self.direction[1] = 1 if (90 < self.angle < 270) else -1
         
@@ -87,12 +118,8 @@ class Player:
             if (self.vector[1] < 0 and self.direction[1] > 0) or (self.vector[1] > 0 and self.direction[1] < 0):
                 self.vector[1] = 0
         
-        for line in self.body:
-            line.move(self.vector[0], self.vector[1])
-        self.top = [self.top[0]+self.vector[0], self.top[1]+self.vector[1]]
         self.center = [self.center[0]+self.vector[0], self.center[1]+self.vector[1]]
 
-        center = self.center[:]
         if self.center[0] > self.width + 31:
             self.center[0] = -31
         elif self.center[0] < -31:
@@ -102,58 +129,219 @@ class Player:
             self.center[1] = -43
         elif self.center[1] < -43:
             self.center[1] = self.height+43
-
-        vector = [self.center[0]-center[0], self.center[1]-center[1]]
-        for line in self.body:
-            line.move(vector[0], vector[1])
-        self.top = [self.top[0]+vector[0], self.top[1]+vector[1]]
         
         if self.safe:
             self.timer -= 1
             self.safe = bool(self.timer)
-
-    def draw(self, surface):
-        if self.safe and not self.dead and not self.timer%25:
-            self.visible = not(self.visible)
+            # Blink every 25 ticks while spawn protection lasts, and always end visible
+            self.visible = not self.safe or (self.timer//25) % 2 == 0
+
+    @property
+    def top(self):
+        """World coordinate of the ship's nose, where bullets are fired from"""
+        s, c = sincos(self.angle)
+        x, y = self.TOP
+        return [c*x - s*y + self.center[0], s*x + c*y + self.center[1]]
+
+    @property
+    def lines(self):
+        """World end points of the ship's lines, rebuilt only after the ship moved, turned or broke apart"""
+        key = (self.center[0], self.center[1], self.angle, self.death_timer)
+        if key != self._key:
+            self._key = key
+            s, c = sincos(self.angle)
+            x, y = self.center
+            self._lines = []
+            for (start, end), (drift_x, drift_y), spin in zip(self.LINES, self.drifts, self.spins):
+                if spin:
+                    # Spin the line around its midpoint in local space
+                    mid_x, mid_y = (start[0]+end[0])/2, (start[1]+end[1])/2
+                    start, end = rotate_coord(start, spin, (mid_x, mid_y)), rotate_coord(end, spin, (mid_x, mid_y))
+                self._lines.append(((c*start[0] - s*start[1] + x + drift_x, s*start[0] + c*start[1] + y + drift_y), 
+                                    (c*end[0] - s*end[1] + x + drift_x, s*end[0] + c*end[1] + y + drift_y)))
+        return self._lines
+
+    @property
+    def rect(self):
+        """pygame.Rect enclosing the ship's lines"""
+        return coords_to_rect([coord for line in self.lines for coord in line])
+
+    def draw(self, surface, alpha=1):
+        """
+        Draw the ship.
+        Arguments:
+            alpha: fraction of the way from the previous tick to the current one
+        Returns:
+            list of the pygame.Rect objects drawn to
+        """
+        rects = []
         if self.visible:
-            for line in self.body:
-                line.aadraw(surface, (255, 255, 255))
-
-        for i in range(self.health):
-            surface.blit(self.HEALTH_IMG, (30 + 35*(i), 50))
+            x, y = interpolate(self.previous, self.center, alpha)
+            x, y = x-self.center[0], y-self.center[1]
+            for (x1, y1), (x2, y2) in self.lines:
+                rects.append(pygame.draw.aaline(surface, (255, 255, 255), (x1+x, y1+y), (x2+x, y2+y)))
+        return rects
 
 class Bullets:
-    def __init__(self, width, height):
+    def __init__(self, width, height, capacity=64):
         self.width, self.height = width, height
-        self.bullets = []
+
+        # Preallocated pool, the live bullets are rows [0, count)
+        self.positions = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))  # Positions before the last tick
+        self.velocities = np.zeros((capacity, 2))
+        self.count = 0
+        self.RADIUS = 2.5
+
         self.VEL = 11
         self.key_pressed = False
-        self.FIRE_SOUND = pygame.mixer.Sound("assets/sounds/fire.wav")
-        self.FIRE_SOUND.set_volume(0.25)
+        self.FIRE_SOUND = ASSETS.sound("assets/sounds/fire.wav", 0.25)
+
+    def __len__(self):
+        return self.count
+
+    def add(self, position, velocity):
+        """Add a bullet to the pool, doubling the pool's size if it is full"""
+        if self.count == len(self.positions):
+            self.positions = np.concatenate((self.positions, np.zeros_like(self.positions)))
+            self.previous = np.concatenate((self.previous, np.zeros_like(self.previous)))
+            self.velocities = np.concatenate((self.velocities, np.zeros_like(self.velocities)))
+        self.positions[self.count] = position
+        self.previous[self.count] = position
+        self.velocities[self.count] = velocity
+        self.count += 1
+
+    def remove(self, index):
+        """Remove a bullet by moving the last bullet into its row"""
+        self.count -= 1
+        self.positions[index] = self.positions[self.count]
+        self.previous[index] = self.previous[self.count]
+        self.velocities[index] = self.velocities[self.count]
 
     def bullet_handler(self, player, fire):
-        for index, bullet in reversed(list(enumerate(self.bullets))):
-            bullet[0].x += bullet[1]
-            bullet[0].y += bullet[2]
-            if not (0 < bullet[0].x < self.width) or not (0 < bullet[0].y < self.height):
-                self.bullets.pop(index)
+        count = self.count
+        if count:
+            self.previous[:count] = self.positions[:count]
+            self.positions[:count] += self.velocities[:count]
+            x, y = self.positions[:count, 0], self.positions[:count, 1]
+            inside = (0 < x) & (x < self.width) & (0 < y) & (y < self.height)
+            remaining = int(inside.sum())
+            if remaining < count:
+                # Fill the rows of the bullets that left the screen from the back of the pool
+                holes = np.flatnonzero(~inside[:remaining])
+                movers = np.flatnonzero(inside[remaining:]) + remaining
+                self.positions[holes] = self.positions[movers]
+                self.previous[holes] = self.previous[movers]
+                self.velocities[holes] = self.velocities[movers]
+                self.count = remaining
 
         if fire and not self.key_pressed and not player.dead:
-            self.FIRE_SOUND.play()
-            self.bullets.append([Circle(player.top, 2.5), self.VEL*sin(radians(player.angle)), -self.VEL*cos(radians(player.angle))])
+            AUDIO.play(self.FIRE_SOUND, "weapons")
+            s, c = sincos(player.angle)
+            self.add(player.top, (self.VEL*s, -self.VEL*c))
             self.key_pressed = True
         elif not fire:
             self.key_pressed = False
 
-    def draw(self, surface):
-        for bullet in self.bullets:
-            bullet[0].draw(surface, (255, 255, 255))
+    def draw(self, surface, alpha=1):
+        # Bullets are culled at the screen edge, so they never wrap and can always be interpolated
+        positions = self.previous[:self.count] + (self.positions[:self.count]-self.previous[:self.count])*alpha
+        return [pygame.draw.circle(surface, (255, 255, 255), position, self.RADIUS) for position in positions]
+
+
+class AsteroidField:
+    """
+    Structure-of-arrays store for the asteroids in play.
+    Row i of every array, and polygons[i], describe the same asteroid.
+    """
+    def __init__(self):
+        self.positions = np.empty((0, 2))
+        self.previous = np.empty((0, 2))  # Positions before the last tick
+        self.velocities = np.empty((0, 2))
+        self.radii = np.empty(0)  # Bounding circle radius, also used for screen wrapping since it holds at any rotation
+        self.sizes = np.empty(0, dtype=np.intp)  # Index into Asteroids.SIZES
+        self.templates = np.empty(0, dtype=np.intp)  # Index into Asteroids.ASTEROID_SHAPES
+        self.angles = np.empty(0)  # Rotation in degrees
+        self.spins = np.empty(0)  # Rotation per tick in degrees
+        self.polygons = []
+
+    def __len__(self):
+        return len(self.polygons)
+
+    def extend(self, positions, velocities, sizes, templates, radii, polygons, spins):
+        """
+        Append a batch of asteroids to the end of the field.
+        Arguments:
+            positions, velocities: arrays of shape (n, 2)
+            sizes, templates, radii, spins: arrays of shape (n,)
+            polygons: list of n Polygon objects
+        """
+        if not len(polygons):
+            return
+        self.positions = np.concatenate((self.positions, positions))
+        self.previous = np.concatenate((self.previous, positions))
+        self.velocities = np.concatenate((self.velocities, velocities))
+        self.radii = np.concatenate((self.radii, radii))
+        self.sizes = np.concatenate((self.sizes, sizes))
+        self.templates = np.concatenate((self.templates, templates))
+        self.angles = np.concatenate((self.angles, np.zeros(len(polygons))))
+        self.spins = np.concatenate((self.spins, spins))
+        self.polygons += polygons
+
+    def remove(self, indices):
+        """
+        Remove a batch of asteroids, keeping the order of the remaining rows.
+        Arguments:
+            indices: row indices to remove
+        """
+        if not len(indices):
+            return
+        keep = np.ones(len(self), dtype=bool)
+        keep[list(indices)] = False
+        self.positions = self.positions[keep]
+        self.previous = self.previous[keep]
+        self.velocities = self.velocities[keep]
+        self.radii = self.radii[keep]
+        self.sizes = self.sizes[keep]
+        self.templates = self.templates[keep]
+        self.angles = self.angles[keep]
+        self.spins = self.spins[keep]
+        self.polygons = [polygon for polygon, kept in zip(self.polygons, keep) if kept]
+
+    def integrate(self, width, height):
+        """Move and spin every asteroid and wrap it around the screen edges"""
+        self.previous = self.positions.copy()
+        self.positions += self.velocities
+        self.angles = (self.angles + self.spins) % 360
+
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        r = self.radii
+        x[:] = np.where(x > width + r, -r, np.where(x < -r, width + r, x))
+        y[:] = np.where(y > height + r, -r, np.where(y < -r, height + r, y))
+
+    def interpolated(self, alpha):
+        """Positions between the last two ticks, snapping the asteroids that wrapped"""
+        delta = self.positions - self.previous
+        wrapped = (np.abs(delta) > 2*self.radii[:, None]).any(axis=1)
+        positions = self.previous + delta*alpha
+        positions[wrapped] = self.positions[wrapped]
+        return positions
+
+    def polygon(self, index):
+        """Return the Polygon of an asteroid, moved and rotated to its current position"""
+        polygon = self.polygons[index]
+        polygon.center = self.positions[index].tolist()
+        polygon.angle = float(self.angles[index])
+        return polygon
 
 
 class Asteroids:
-    def __init__(self, width, height):
+    def __init__(self, width, height, rng=None, particle_rng=None):
         self.width, self.height = width, height
-        self.asteroids = []
+        self.rng = rng or random
+        self.asteroids = AsteroidField()
+        self.grid = SpatialHash(width, height)
+        self.probe = Circle([0, 0], 1)  # Reused for bullet collision tests
         self.spawn_range = [
             [0, width//3, 0, height//3], 
             [width//3, int(width*(2/3)), 0, height//3], 
@@ -165,171 +353,182 @@ class Asteroids:
             [int(width*(2/3)), width, int(height*(2/3)), height]
         ]
 
-        self.ASTEROID_SHAPES = [
-                [[23, 0],
-                [72, 12],
-                [79, 46],
-                [64, 71],
-                [25, 79],
-                [0, 51],
-                [0, 18]],
-
-                [[25, 0],
-                [79, 24],
-                [79, 54],
-                [46, 79],
-                [2, 61],
-                [0, 19]],
-
-                [[25, 2],
-                [66, 0],
-                [79, 38],
-                [67, 63],
-                [38, 79],
-                [14, 69],
-                [0, 20]]
-        ]
+        self.ASTEROID_SHAPES = ASTEROID_SHAPES
 
         self.asteroid_no = 4
         self.SCALE_FACTORS = [1, 0.625, 0.325]
         self.VELS = [1, 2, 1.75]
         self.SIZES = ["L", "M", "S"]
         self.SCORES = [20, 50, 100]
+        self.SPINS = [-2, -1, 1, 2]  # Degrees per tick, whole degrees stay in the rotation table
+
+        # Per size and template: the prefab, with its outline and bounding radius
+        self.prefabs = [[get_prefab(template, scale) for template in range(len(self.ASTEROID_SHAPES))] for scale in self.SCALE_FACTORS]
+        self.outlines = [[prefab.outline for prefab in row] for row in self.prefabs]
+        self.RADII = np.array([[prefab.radius for prefab in row] for row in self.prefabs])
 
-        # [pos, x_vel, y_vel, timer]
-        self.particles = []
-        self.DECAY = 1.2
+        self.particles = Particles(decay=1.2, rng=particle_rng)
 
         self.score_count = 1
-        self.DEATH_SOUND = pygame.mixer.Sound("assets/sounds/dead.wav")
-        self.DEATH_SOUND.set_volume(0.25)
-        self.ASTEROID_SOUND = pygame.mixer.Sound("assets/sounds/asteroid hit.wav")
-        self.ASTEROID_SOUND.set_volume(0.1)
+        self.DEATH_SOUND = ASSETS.sound("assets/sounds/dead.wav", 0.25)
+        self.ASTEROID_SOUND = ASSETS.sound("assets/sounds/asteroid hit.wav", 0.1)
 
     def spawn_particles(self, coord):
-        number = random.randint(3, 5)
-        x_vels = []
-        y_vels = []
-        for i in range (number):
-            x_vel, y_vel, x_vels, y_vels = self.velocity_randomizer(1.5, x_vels, y_vels)
-            x_vels.append(x_vel)
-            y_vels.append(y_vel)
-            timer = random.randint(45, 60)
-            self.particles.append([coord[:], x_vel, y_vel, timer])
+        self.particles.spawn(coord, self.particles.rng.randint(3, 5))
 
     def handle_particles(self):
-        for index, particle in reversed(list(enumerate(self.particles))):
-            particle[0][0] += particle[1]
-            particle[0][1] += particle[2]
-            particle[3] -= self.DECAY 
-            if particle[3] <= 0: 
-                self.particles.pop(index)
+        self.particles.update()
 
     def velocity_randomizer(self, size, x_vels, y_vels):
-        x_vel = random.uniform(-size, size)
+        x_vel = self.rng.uniform(-size, size)
         while (x_vel in x_vels) or -0.1 < x_vel < 0.1: 
-            x_vel = random.uniform(-size, size)
-        y_vel = random.uniform(-size, size)
+            x_vel = self.rng.uniform(-size, size)
+        y_vel = self.rng.uniform(-size, size)
         while (y_vel in y_vels) or -0.1 < y_vel < 0.1:
-            y_vel = random.uniform(-size, size)
+            y_vel = self.rng.uniform(-size, size)
         
         return x_vel, y_vel, x_vels, y_vels
 
+    def add(self, positions, velocities, sizes, templates, spins=None):
+        """
+        Add a batch of asteroids to the field.
+        Arguments:
+            positions, velocities: lists of (x, y)
+            sizes, templates: lists of indices into SIZES and ASTEROID_SHAPES
+            spins: list of degrees turned per tick, picked from SPINS if None
+        """
+        if not len(sizes):
+            return
+        if spins is None:
+            spins = [self.rng.choice(self.SPINS) for size in sizes]
+        sizes = np.array(sizes, dtype=np.intp)
+        templates = np.array(templates, dtype=np.intp)
+        polygons = [self.prefabs[size][template].clone(position) for size, template, position in zip(sizes, templates, positions)]
+        self.asteroids.extend(np.array(positions, dtype=float), np.array(velocities, dtype=float), sizes, templates, 
+                            self.RADII[sizes, templates], polygons, np.array(spins, dtype=float))
+
     def next_round(self):
         """
         Start the next round
         """
         x_vels = []
         y_vels = []
+        positions, velocities, templates, spins = [], [], [], []
         for i in range(self.asteroid_no):
             x_vel, y_vel, x_vels, y_vels = self.velocity_randomizer(self.VELS[0], x_vels, y_vels)
             x_vels.append(x_vel)
             y_vels.append(y_vel)
-            asteroid = Polygon(random.choice(self.ASTEROID_SHAPES))
-            spawn = random.choice(self.spawn_range)
-            asteroid.center = [random.randrange(spawn[0], spawn[1]), random.randrange(spawn[2], spawn[3])]
-            self.asteroids.append([asteroid, x_vel, y_vel, "L", 1, 1])
+            templates.append(self.rng.randrange(len(self.ASTEROID_SHAPES)))
+            spawn = self.rng.choice(self.spawn_range)
+            positions.append([self.rng.randrange(spawn[0], spawn[1]), self.rng.randrange(spawn[2], spawn[3])])
+            velocities.append([x_vel, y_vel])
+            spins.append(self.rng.choice(self.SPINS))
 
+        self.add(positions, velocities, [0]*self.asteroid_no, templates, spins)
         return self
 
-    def spawn_new(self, asteroid):
-        asteroids = []
+    def spawn_new(self, index):
+        """
+        Create the fragments of a destroyed asteroid.
+        Arguments:
+            index: row of the asteroid in the field
+        Returns:
+            list of [position, velocity, size, template, spin] rows
+        """
+        fragments = []
         x_vels = []
         y_vels = []
-        if asteroid[3] != "S":
+        size = int(self.asteroids.sizes[index]) + 1
+        if size < len(self.SIZES):
             for i in range(2):
-                x_vel, y_vel, x_vels, y_vels = self.velocity_randomizer(self.VELS[self.SIZES.index(asteroid[3])+1], x_vels, y_vels)
-                new_asteroid = Polygon(random.choice(self.ASTEROID_SHAPES)).enlarge(self.SCALE_FACTORS[self.SIZES.index(asteroid[3])+1])
-                new_asteroid.center = asteroid[0].center
-                asteroids.append([new_asteroid, x_vel, y_vel, self.SIZES[self.SIZES.index(asteroid[3])+1], 1, 1])
+                x_vel, y_vel, x_vels, y_vels = self.velocity_randomizer(self.VELS[size], x_vels, y_vels)
+                template = self.rng.randrange(len(self.ASTEROID_SHAPES))
+                fragments.append([self.asteroids.positions[index].tolist(), [x_vel, y_vel], size, template, self.rng.choice(self.SPINS)])
 
                 x_vels.append(x_vel)
                 y_vels.append(y_vel)
         
-        return asteroids
-
-    def move(self, player, bullets, score, game_over, shake):
-        new_asteroids = []
-        for index, asteroid in reversed(list(enumerate(self.asteroids))):
-            asteroid[0].move(asteroid[1], asteroid[2])
-
-            # Check if the asteroid has moved out of the screen and move it to the other side
-            if asteroid[0].center[0] > self.width + asteroid[0].rect.width//2:
-                asteroid[0].center = [-asteroid[0].rect.width//2, asteroid[0].center[1]]
-            elif asteroid[0].center[0] < -asteroid[0].rect.width//2:
-                asteroid[0].center = [self.width + asteroid[0].rect.width//2, asteroid[0].center[1]]
-
-            if asteroid[0].center[1] > self.width + asteroid[0].rect.height//2:
-                asteroid[0].center = [asteroid[0].center[0], -asteroid[0].rect.height//2]
-            elif asteroid[0].center[1] < -asteroid[0].rect.height//2:
-                asteroid[0].center = [asteroid[0].center[0], self.height + asteroid[0].rect.height//2]
-
-            collision = False
-            # Check for bullet-asteroid collisions
-            for j, bullet in reversed(list(enumerate(bullets))):
-                if asteroid[0].collidecircle(bullet[0]):
-                    score += self.SCORES[self.SIZES.index(asteroid[3])]
-                    new_asteroids += self.spawn_new(asteroid)
-                    self.spawn_particles(asteroid[0].center)
-                    self.ASTEROID_SOUND.play()
-                    self.asteroids.pop(index)
-                    bullets.pop(j)
+        return fragments
+
+    def destroy(self, index, fragments):
+        """Score, split and explode an asteroid, returning its score value"""
+        fragments += self.spawn_new(index)
+        self.spawn_particles(self.asteroids.positions[index].tolist())
+        return self.SCORES[self.asteroids.sizes[index]]
+
+    def move(self, player, bullets, score, shake):
+        field = self.asteroids
+        field.integrate(self.width, self.height)
+
+        destroyed = []
+        fragments = []
+
+        # Register everything in the broadphase grid so only objects sharing a cell are tested
+        self.grid.clear()
+        self.grid.insert_many("asteroids", field.positions, field.radii)
+        if len(bullets):
+            self.grid.insert_many("bullets", bullets.positions[:len(bullets)], bullets.RADIUS)
+        if not player.dead and not player.safe:
+            self.grid.insert("player", 0, player.center, player.RADIUS)
+
+        # Check for bullet-asteroid collisions
+        used = set()
+        self.probe.radius = bullets.RADIUS
+        candidates = self.grid.pairs("asteroids", "bullets")
+        for index in sorted(candidates, reverse=True):
+            position, radius = field.positions[index], field.radii[index]
+            polygon = None
+            for j in sorted(candidates[index], reverse=True):
+                x, y = bullets.positions[j]
+                if j in used or (position[0]-x)**2 + (position[1]-y)**2 > (radius+bullets.RADIUS)**2:
+                    continue
+                polygon = polygon or field.polygon(index)
+                self.probe.center = [x, y]
+                if polygon.collidecircle(self.probe):
+                    score += self.destroy(index, fragments)
+                    AUDIO.play(self.ASTEROID_SOUND, "impacts")
+                    destroyed.append(index)
+                    used.add(j)
                     shake = True
-                    collision = True
                     break
 
-            if collision:
-                continue
+        for j in sorted(used, reverse=True):
+            bullets.remove(j)
 
-            if score >= 10000*self.score_count:
-                player.health += 1
-                if player.health > 5:
-                    player.health = 5
-                self.score_count += 1
-
-            # Check if the player has collided with the asteroid
-            if not player.dead:
-                for line in player.body:
-                    if line.collidepolygon(asteroid[0]) and not player.safe:
-                        self.DEATH_SOUND.play()
-                        self.ASTEROID_SOUND.play()
-                        player.health -= 1
-                        player.dead = True
-                        game_over.game_over = not player.health
-                        score += self.SCORES[self.SIZES.index(asteroid[3])]
-                        new_asteroids += self.spawn_new(asteroid)
-                        self.spawn_particles(asteroid[0].center)
-                        self.asteroids.pop(index)
-                        shake = True
-                        break
-                
-        self.asteroids += new_asteroids
+        if score >= 10000*self.score_count:
+            player.health += 1
+            if player.health > 5:
+                player.health = 5
+            self.score_count += 1
+
+        # Check if the player has collided with an asteroid, bounding circles first
+        candidates = self.grid.pairs("asteroids", "player")
+        for index in sorted(set(candidates) - set(destroyed), reverse=True):
+            position, radius = field.positions[index], field.radii[index]
+            if (position[0]-player.center[0])**2 + (position[1]-player.center[1])**2 > (radius+player.RADIUS)**2:
+                continue
+            polygon = field.polygon(index)
+            if player.HULL.collide(player.center, polygon.template, polygon.center, player.angle, polygon.angle):
+                AUDIO.play(self.DEATH_SOUND, "player")
+                AUDIO.play(self.ASTEROID_SOUND, "impacts")
+                player.health -= 1
+                player.dead = True
+                score += self.destroy(index, fragments)
+                destroyed.append(index)
+                shake = True
+                break
+
+        field.remove(destroyed)
+        if fragments:
+            self.add(*[list(column) for column in zip(*fragments)])
         self.handle_particles()
         return score, shake
 
-    def draw(self, surface):
-        for asteroid in self.asteroids:
-            asteroid[0].draw(surface, (255, 255, 255), 2)
+    def draw(self, surface, alpha=1):
+        field = self.asteroids
+        positions = field.interpolated(alpha) if alpha != 1 else field.positions
+        angles = field.angles - field.spins*(1-alpha) if alpha != 1 else field.angles
+        rects = SPRITES.draw(surface, [((template, self.SCALE_FACTORS[size]), self.outlines[size][template], position, angle) 
+                                for position, size, template, angle in zip(positions.tolist(), field.sizes.tolist(), field.templates.tolist(), angles.tolist())])
 
-        for particle in self.particles:
-            pygame.draw.circle(surface, (255, 255, 255), particle[0], 2)
\ No newline at end of file
+        return rects + self.particles.draw(surface, alpha)
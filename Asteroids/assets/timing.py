@@ -0,0 +1,198 @@
+"""
+Module containing the fixed timestep scheduler for the game simulation, and the frame limiter.
+The simulation always advances in steps of the same length, however fast frames are rendered.
+"""
+
+import json
+import pygame
+from time import perf_counter, sleep
+
+class FixedTimestep:
+    def __init__(self, rate: int=60, max_ticks: int=8):
+        """
+        Creates a FixedTimestep scheduler.
+        Arguments:
+            rate: simulation ticks per second
+            max_ticks: most ticks run for one rendered frame. A machine that falls
+                further behind than this slows the simulation down instead of stalling.
+        """
+        self.rate = rate
+        self.step = 1/rate
+        self.max_ticks = max_ticks
+
+        self.accumulator = 0
+        self.alpha = 1  # How far the rendered frame is between the last two ticks
+        self.last = None
+
+        self.ticks_per_second = 0
+        self.renders_per_second = 0
+        self._window_start = perf_counter()
+        self._ticks = 0
+        self._renders = 0
+
+    def reset(self):
+        """Forget the time that passed, e.g. while paused or in a menu"""
+        self.accumulator = 0
+        self.alpha = 1
+        self.last = None
+
+    def advance(self):
+        """
+        Add the time since the last call and work out how many ticks are due.
+        Called once per rendered frame.
+        Returns:
+            number of simulation ticks to run before rendering
+        """
+        now = perf_counter()
+        if self.last is None:
+            self.last = now - self.step
+        self.accumulator += now - self.last
+        self.last = now
+
+        ticks = int(self.accumulator / self.step)
+        if ticks > self.max_ticks:
+            ticks = self.max_ticks
+            self.accumulator = ticks*self.step
+        self.accumulator -= ticks*self.step
+        self.alpha = self.accumulator / self.step
+
+        self._ticks += ticks
+        self._renders += 1
+        if now - self._window_start >= 1:
+            self.ticks_per_second = self._ticks / (now - self._window_start)
+            self.renders_per_second = self._renders / (now - self._window_start)
+            self._window_start = now
+            self._ticks = 0
+            self._renders = 0
+
+        return ticks
+
+
+def interpolate(previous, current, alpha: float, limit: float=100):
+    """
+    Returns the position between two states to draw, snapping to the current
+    state when the object jumped further than limit, e.g. when it wrapped around the screen
+    """
+    if abs(current[0]-previous[0]) > limit or abs(current[1]-previous[1]) > limit:
+        return current
+    return [previous[0] + (current[0]-previous[0])*alpha, previous[1] + (current[1]-previous[1])*alpha]
+
+
+class FrameScheduler:
+    MODES = ("low-cpu", "precise")
+
+    def __init__(self, fps: int=60, mode: str="low-cpu", spin: float=0.002, tolerance: float=0.1, bins: int=100):
+        """
+        Creates a FrameScheduler, the frame limiter every scene waits on at the end of a frame.
+        Arguments:
+            fps: frames per second to hold to
+            mode: "low-cpu" sleeps the whole wait with pygame.time.Clock, which can oversleep by a
+                millisecond or more. "precise" sleeps until spin seconds before the deadline and busy waits the rest.
+            spin: seconds busy waited at the end of each frame in precise mode
+            tolerance: fraction of a frame a frame can run over before it is counted as late
+            bins: number of 1 ms wide bins of the frame time histogram, longer frames go in one extra bin
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"unknown frame limiter mode {mode!r}, expected one of {self.MODES}")
+        self.fps = fps
+        self.period = 1/fps
+        self.mode = mode
+        self.spin = spin
+        self.tolerance = tolerance
+
+        self.clock = pygame.time.Clock()
+        self.start = perf_counter()  # When the current frame began
+        self.deadline = self.start + self.period  # When the current frame should end, in precise mode
+
+        self.frames = 0
+        self.late = 0  # Frames longer than a period plus the tolerance
+        self.dropped = 0  # Whole periods missed by frames that ran long
+        self.total = 0  # Seconds over all frames
+        self.longest = 0
+        self.histogram = [0]*(bins + 1)  # Frames per whole ms of frame time
+
+    def reset(self):
+        """Start timing the current frame from now, e.g. when the game loop starts"""
+        self.start = perf_counter()
+        self.deadline = self.start + self.period
+
+    def wait(self):
+        """
+        End the frame, waiting until the next one is due.
+        Returns:
+            length of the frame that ended in seconds
+        """
+        if self.mode == "precise":
+            now = perf_counter()
+            if now - self.deadline > self.period:
+                self.deadline = now  # Too far behind to catch up, start the cadence again from here
+            if self.deadline - now > self.spin:
+                sleep(self.deadline - now - self.spin)
+            while perf_counter() < self.deadline:
+                pass
+            self.deadline += self.period
+        else:
+            self.clock.tick(self.fps)
+
+        end = perf_counter()
+        frame, self.start = end - self.start, end
+        self.record(frame)
+        return frame
+
+    def record(self, frame: float):
+        """Add a frame time in seconds to the counters"""
+        self.frames += 1
+        self.total += frame
+        self.longest = max(self.longest, frame)
+        if frame > self.period*(1 + self.tolerance):
+            self.late += 1
+            self.dropped += max(0, round(frame/self.period) - 1)
+        self.histogram[min(int(frame*1000), len(self.histogram) - 1)] += 1
+
+    def percentile(self, fraction: float):
+        """Returns the frame time in ms below which a fraction of the frames fall, to the histogram's 1 ms"""
+        if not self.frames:
+            return 0
+        target = fraction*self.frames
+        count = 0
+        for ms, frames in enumerate(self.histogram):
+            count += frames
+            if count >= target:
+                return ms + 1
+        return len(self.histogram)
+
+    def stats(self):
+        """
+        Returns:
+            dict of the counters, with frame times in ms
+        """
+        return {
+            "mode": self.mode,
+            "fps": self.fps,
+            "frames": self.frames,
+            "late": self.late,
+            "dropped": self.dropped,
+            "average": self.total/self.frames*1000 if self.frames else 0,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "longest": self.longest*1000,
+            "histogram": {ms: frames for ms, frames in enumerate(self.histogram) if frames},
+        }
+
+    def report(self):
+        """Returns the counters as text, with a bar per histogram bin that has frames"""
+        stats = self.stats()
+        lines = [f"{stats['frames']} frames at {stats['fps']} fps ({stats['mode']}): {stats['late']} late, {stats['dropped']} dropped",
+                f"frame time average {stats['average']:.2f} ms, p50 < {stats['p50']} ms, p99 < {stats['p99']} ms, longest {stats['longest']:.2f} ms"]
+        most = max(stats["histogram"].values(), default=1)
+        for ms, frames in stats["histogram"].items():
+            label = f"{ms:>3}-{ms + 1:<3}ms" if ms < len(self.histogram) - 1 else f"{ms:>3}+    ms"
+            lines.append(f"{label} {frames:>7} {'#'*max(1, round(40*frames/most))}")
+        return "\n".join(lines)
+
+    def dump(self, path: str=None):
+        """Print the report, and write the counters as JSON to path if one is given"""
+        print(self.report())
+        if path:
+            with open(path, "w") as file:
+                json.dump(self.stats(), file, indent=2)
@@ -0,0 +1,185 @@
+"""
+Module containing the batched environment API for running many games at once, e.g. for bot evaluation.
+Games are sharded across worker processes. Actions, observations, rewards and
+done flags live in shared arrays that every process reads and writes in place.
+"""
+
+import os
+import multiprocessing as mp
+from math import sin, cos, radians
+
+import numpy as np
+
+from assets import audio
+from assets.simulation import Simulation
+from assets.replay import unpack
+
+PLAYER_FEATURES = 8  # x, y, vx, vy, sin(angle), cos(angle), health, dead or safe
+ASTEROID_FEATURES = 5  # dx, dy, vx, vy, radius, for the nearest asteroids
+NEAREST = 8
+OBSERVATION_SIZE = PLAYER_FEATURES + NEAREST*ASTEROID_FEATURES
+
+def observe(simulation: Simulation, out):
+    """
+    Write the observation of a game into a row of the observation array.
+    Positions are scaled by the screen size, and asteroid offsets are taken the
+    short way around the wrapping screen, nearest asteroid first. Missing asteroids are zeros.
+    """
+    player, field = simulation.player, simulation.asteroids.asteroids
+    width, height = simulation.width, simulation.height
+    x, y = player.center
+    angle = radians(player.angle)
+    out[:PLAYER_FEATURES] = (x/width, y/height, player.vector[0]/player.VEL, player.vector[1]/player.VEL,
+                            sin(angle), cos(angle), player.health/5, player.dead or player.safe)
+
+    rocks = out[PLAYER_FEATURES:].reshape(NEAREST, ASTEROID_FEATURES)
+    rocks[:] = 0
+    if len(field):
+        offsets = field.positions - (x, y)
+        offsets[:, 0] = (offsets[:, 0] + width/2) % width - width/2
+        offsets[:, 1] = (offsets[:, 1] + height/2) % height - height/2
+        nearest = np.argsort((offsets**2).sum(axis=1))[:NEAREST]
+        count = len(nearest)
+        rocks[:count, 0] = offsets[nearest, 0]/width
+        rocks[:count, 1] = offsets[nearest, 1]/height
+        rocks[:count, 2:4] = field.velocities[nearest]
+        rocks[:count, 4] = field.radii[nearest]/width
+
+
+class Shard:
+    """The games run by one process and their rows of the shared arrays"""
+    def __init__(self, start: int, stop: int, seed: int, arrays: tuple, ticks_per_step: int=1):
+        audio.disable()
+        self.start, self.stop = start, stop
+        self.actions, self.observations, self.rewards, self.dones = [array[start:stop] for array in arrays]
+        self.games = [Simulation(seed=seed + i) for i in range(start, stop)]
+        self.ticks_per_step = ticks_per_step
+
+    def reset(self):
+        for i, game in enumerate(self.games):
+            game.reset()
+            observe(game, self.observations[i])
+        self.rewards[:] = 0
+        self.dones[:] = False
+
+    def step(self):
+        for i, game in enumerate(self.games):
+            score = game.score
+            move, fire, keys = unpack(int(self.actions[i]))
+            for tick in range(self.ticks_per_step):
+                game.tick(move, fire, keys)
+                if game.finished:
+                    break
+            self.rewards[i] = game.score - score
+            # Finished games start over at once, the done flag tells the caller
+            self.dones[i] = game.finished
+            if game.finished:
+                game.reset()
+            observe(game, self.observations[i])
+
+
+def worker(connection, start, stop, seed, buffers, size, ticks_per_step):
+    shard = Shard(start, stop, seed, views(buffers, size), ticks_per_step)
+    while True:
+        command = connection.recv()
+        if command == "step":
+            shard.step()
+        elif command == "reset":
+            shard.reset()
+        elif command == "close":
+            connection.close()
+            return
+        connection.send(True)
+
+
+def views(buffers, size: int):
+    """Returns the numpy arrays backed by the shared buffers"""
+    actions, observations, rewards, dones = buffers
+    return (np.frombuffer(actions, dtype=np.uint8),
+            np.frombuffer(observations, dtype=np.float32).reshape(size, OBSERVATION_SIZE),
+            np.frombuffer(rewards, dtype=np.float32),
+            np.frombuffer(dones, dtype=np.bool_))
+
+
+class VecEnv:
+    def __init__(self, size: int, workers: int=None, seed: int=0, ticks_per_step: int=1):
+        """
+        Creates a VecEnv of independent games.
+        Arguments:
+            size: number of games
+            workers: number of worker processes, one per core if None. With 0 the games run in this process.
+            seed: game i is seeded with seed + i
+            ticks_per_step: simulation ticks each action is held for
+        """
+        self.size = size
+        self.workers = min(size, os.cpu_count() or 1) if workers is None else min(workers, size)
+
+        self.buffers = (mp.RawArray("B", size), mp.RawArray("B", size*OBSERVATION_SIZE*4),
+                        mp.RawArray("B", size*4), mp.RawArray("B", size))
+        self.actions, self.observations, self.rewards, self.dones = views(self.buffers, size)
+
+        self.connections = []
+        self.processes = []
+        self.shard = None
+        if not self.workers:
+            self.shard = Shard(0, size, seed, (self.actions, self.observations, self.rewards, self.dones), ticks_per_step)
+            return
+
+        bounds = np.linspace(0, size, self.workers + 1).astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = mp.Pipe()
+            process = mp.Process(target=worker, args=(child, int(start), int(stop), seed, self.buffers, size, ticks_per_step), daemon=True)
+            process.start()
+            child.close()
+            self.connections.append(parent)
+            self.processes.append(process)
+
+    def __len__(self):
+        return self.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def command(self, command: str):
+        """Run a command on every shard and wait for all of them to finish"""
+        if self.shard is not None:
+            getattr(self.shard, command)()
+            return
+        for connection in self.connections:
+            connection.send(command)
+        for connection in self.connections:
+            connection.recv()
+
+    def reset(self):
+        """
+        Start a new game in every environment.
+        Returns:
+            observation array of shape (size, OBSERVATION_SIZE), shared and overwritten by the next call
+        """
+        self.command("reset")
+        return self.observations
+
+    def step(self, actions):
+        """
+        Advance every game by one step.
+        Arguments:
+            actions: array of shape (size,) of key bitmasks, MOVE | FIRE | LEFT | RIGHT
+        Returns:
+            (observations, rewards, dones), shared arrays overwritten by the next call.
+            rewards are the score gained during the step. A done game has already been
+            reset, and its observation is the first of the new game.
+        """
+        self.actions[:] = actions
+        self.command("step")
+        return self.observations, self.rewards, self.dones
+
+    def close(self):
+        for connection in self.connections:
+            connection.send("close")
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
@@ -0,0 +1,52 @@
+"""
+Full-frame benchmarks of Asteroids_Game.draw.
+Meant to run under the SDL dummy video driver, which run.py selects unless another driver is set.
+"""
+
+import random
+
+from pygame.locals import K_LEFT, K_RIGHT
+
+from benchmarks.harness import Benchmark
+
+ASTEROID_COUNTS = [4, 16, 64]
+
+def game(asteroids: int, seed: int=0):
+    """Returns an Asteroids_Game in play with a number of asteroids on screen"""
+    import main
+
+    rng = random.Random(seed)
+    game = main.Asteroids_Game(seed)
+    game.menu.menu = False
+    simulation = game.simulation
+    simulation.player.safe, simulation.player.timer = True, 10**9
+    simulation.asteroids.asteroids.remove(range(len(simulation.asteroids.asteroids)))
+    simulation.asteroids.add([[rng.uniform(0, game.WIDTH), rng.uniform(0, game.HEIGHT)] for i in range(asteroids)],
+                            [[rng.uniform(-2, 2), rng.uniform(-2, 2)] for i in range(asteroids)],
+                            [rng.randrange(3) for i in range(asteroids)],
+                            [rng.randrange(3) for i in range(asteroids)])
+    for tick in range(30):
+        simulation.tick(True, tick % 6 == 0, {K_LEFT: False, K_RIGHT: False})
+    simulation.shake_timer = 0
+    game.draw()
+    return game
+
+
+def benchmarks():
+    for count in ASTEROID_COUNTS:
+        state = game(count)
+
+        def draw(state=state):
+            state.draw(0.5)
+
+        def draw_full(state=state):
+            state.renderer.invalidate()
+            state.draw(0.5)
+
+        def tick(state):
+            state.update()
+
+        yield Benchmark(f"frame.draw[asteroids={count}]", draw)
+        yield Benchmark(f"frame.draw_full[asteroids={count}]", draw_full)
+        # Every sample ticks a new game, so the asteroids have not drifted or split since the last one
+        yield Benchmark(f"frame.tick[asteroids={count}]", tick, lambda count=count: game(count))
@@ -0,0 +1,126 @@
+"""
+Module containing the benchmark harness: timing, statistics and baseline comparison.
+"""
+
+import gc
+import sys
+import platform
+from time import perf_counter, strftime
+
+import numpy as np
+import pygame
+
+class Benchmark:
+    def __init__(self, name: str, function, setup=None, number: int=None):
+        """
+        Creates a Benchmark.
+        Arguments:
+            name: dotted name, e.g. "shapes.polygon.rotate[vertices=8]"
+            function: the code being timed. Called with no arguments, or with
+                the return value of setup when there is one.
+            setup: called before every sample and not timed, for code that
+                changes the state it runs on
+            number: calls per sample, calibrated automatically if None.
+                Always 1 when there is a setup.
+        """
+        self.name = name
+        self.function = function
+        self.setup = setup
+        self.number = 1 if setup else number
+
+    def calibrate(self, target: float=0.001):
+        """Find how many calls make a sample take at least target seconds"""
+        number = 1
+        while True:
+            start = perf_counter()
+            for i in range(number):
+                self.function()
+            if perf_counter() - start >= target or number >= 1 << 20:
+                return number
+            number *= 2
+
+    def sample(self):
+        """Returns the time of one call in seconds, averaged over the sample"""
+        if self.setup:
+            state = self.setup()
+            start = perf_counter()
+            self.function(state)
+            return perf_counter() - start
+
+        function = self.function
+        start = perf_counter()
+        for i in range(self.number):
+            function()
+        return (perf_counter() - start) / self.number
+
+    def run(self, repeat: int=50, warmup: int=3):
+        """
+        Time the benchmark.
+        Returns:
+            dict of statistics in microseconds
+        """
+        if self.number is None:
+            self.number = self.calibrate()
+        for i in range(warmup):
+            self.sample()
+
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            samples = np.array([self.sample() for i in range(repeat)]) * 1e6
+        finally:
+            if enabled:
+                gc.enable()
+        return statistics(samples, self.number)
+
+
+def statistics(samples, number: int=1):
+    """Returns the summary of an array of timings"""
+    return {
+        "unit": "us",
+        "samples": len(samples),
+        "number": number,
+        "min": float(samples.min()),
+        "mean": float(samples.mean()),
+        "median": float(np.percentile(samples, 50)),
+        "p90": float(np.percentile(samples, 90)),
+        "p99": float(np.percentile(samples, 99)),
+        "max": float(samples.max()),
+    }
+
+
+def metadata():
+    return {
+        "time": strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float=0.1):
+    """
+    Compare two sets of results by their medians.
+    Arguments:
+        results, baseline: "results" sections of two result files
+        threshold: relative slowdown above which a benchmark counts as a regression
+    Returns:
+        list of (name, baseline median, new median, ratio, verdict)
+    """
+    rows = []
+    for name, stats in results.items():
+        if name not in baseline:
+            rows.append((name, None, stats["median"], None, "new"))
+            continue
+        old = baseline[name]["median"]
+        ratio = stats["median"] / old if old else float("inf")
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+        elif ratio < 1 - threshold:
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, old, stats["median"], ratio, verdict))
+    return rows
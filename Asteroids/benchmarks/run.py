@@ -0,0 +1,79 @@
+"""
+Benchmark runner. From the Asteroids directory:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --compare results.json
+    python -m benchmarks.run --filter shapes.polygon --repeat 100
+"""
+
+import os
+import sys
+import json
+import argparse
+
+# Full frames are drawn without a window or an audio device unless a driver is chosen
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+# Asset paths are relative to the Asteroids directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.harness import metadata, compare
+from benchmarks import shapes_bench, sprites_bench, frame_bench
+
+SUITES = {
+    "shapes": shapes_bench,
+    "sprites": sprites_bench,
+    "frame": frame_bench,
+}
+
+def collect(suites: list, pattern: str=None):
+    """Returns the benchmarks of the chosen suites whose names contain pattern"""
+    for suite in suites:
+        for benchmark in SUITES[suite].benchmarks():
+            if pattern is None or pattern in benchmark.name:
+                yield benchmark
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Asteroids benchmarks.")
+    parser.add_argument("--suite", action="append", choices=list(SUITES), help="suite to run, may be repeated (default: all)")
+    parser.add_argument("--filter", default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=50, help="samples per benchmark (default: %(default)s)")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+    parser.add_argument("--compare", metavar="BASELINE", default=None, help="compare against a saved results file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative slowdown counted as a regression (default: %(default)s)")
+    args = parser.parse_args()
+
+    results = {}
+    for benchmark in collect(args.suite or list(SUITES), args.filter):
+        stats = benchmark.run(args.repeat)
+        results[benchmark.name] = stats
+        print(f"{benchmark.name:<64} median {stats['median']:>11.2f}us  p99 {stats['p99']:>11.2f}us")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"meta": metadata(), "results": results}, file, indent=2)
+        print(f"wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+        rows = compare(results, baseline, args.threshold)
+        print()
+        print(f"{'benchmark':<64} {'baseline':>11} {'now':>11} {'ratio':>7}")
+        for name, old, new, ratio, verdict in rows:
+            old = f"{old:.2f}" if old is not None else "-"
+            ratio = f"{ratio:.2f}" if ratio is not None else "-"
+            print(f"{name:<64} {old:>11} {new:>11.2f} {ratio:>7}  {verdict}")
+        regressions = [row for row in rows if row[4] == "REGRESSION"]
+        print(f"{len(regressions)} regressions out of {len(rows)} benchmarks")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
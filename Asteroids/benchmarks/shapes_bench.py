@@ -0,0 +1,90 @@
+"""
+Micro-benchmarks of the collision and transform methods in assets/shapes.py.
+Polygon benchmarks are swept over the vertex count.
+"""
+
+import random
+from math import cos, sin, pi
+
+import pygame
+
+from assets.shapes import Circle, Polygon, Line, rotate_coord
+from benchmarks.harness import Benchmark
+
+VERTEX_COUNTS = [3, 6, 12, 24, 48]
+
+def regular_polygon(vertices: int, radius: float=40, center=(100, 100), rng=None):
+    """Returns the coordinates of a roughly regular polygon with a little jitter"""
+    rng = rng or random.Random(vertices)
+    coordinates = []
+    for i in range(vertices):
+        angle = 2*pi*i/vertices
+        length = radius*rng.uniform(0.85, 1)
+        coordinates.append([center[0] + length*cos(angle), center[1] + length*sin(angle)])
+    return coordinates
+
+
+def benchmarks():
+    circle = Circle([110, 95], 10)
+    far_circle = Circle([400, 400], 10)
+    line = Line([[60, 60], [150, 130]])
+    far_line = Line([[400, 400], [450, 420]])
+    rect = pygame.Rect(90, 90, 30, 30)
+    other = Polygon(regular_polygon(7, 30, (130, 110)))
+
+    # Circle
+    yield Benchmark("shapes.circle.collidepoint", lambda: circle.collidepoint((112, 97)))
+    yield Benchmark("shapes.circle.collidecircle", lambda: circle.collidecircle(far_circle))
+    yield Benchmark("shapes.circle.colliderect", lambda: circle.colliderect(rect))
+    yield Benchmark("shapes.circle.collideline", lambda: circle.collideline(line.boundary))
+    yield Benchmark("shapes.circle.collidelines", lambda: circle.collidelines(other.boundaries))
+    yield Benchmark("shapes.circle.collidepolygon", lambda: circle.collidepolygon(other))
+    yield Benchmark("shapes.circle.move", lambda: circle.move(0, 0))
+
+    # Line, a new one for each benchmark that transforms it, so the collision benchmarks keep theirs in place
+    def new_line():
+        return Line([[60, 60], [150, 130]])
+
+    yield Benchmark("shapes.line.collidelines", lambda: line.collidelines(other.boundaries))
+    yield Benchmark("shapes.line.colliderect", lambda: line.colliderect(rect))
+    yield Benchmark("shapes.line.collidecircle", lambda: line.collidecircle(circle))
+    yield Benchmark("shapes.line.collidepolygon", lambda: line.collidepolygon(other))
+    yield Benchmark("shapes.line.move", lambda line=new_line(): line.move(0, 0))
+    yield Benchmark("shapes.line.move_to", lambda line=new_line(): line.move_to((105, 95)))
+    yield Benchmark("shapes.line.rotate", lambda line=new_line(): line.rotate(3))
+    yield Benchmark("shapes.line.enlarge", lambda line=new_line(): line.enlarge(1))
+    yield Benchmark("shapes.line.reorder_coords", lambda line=new_line(): line.reorder_coords([[150, 130], [60, 60]]))
+
+    # Polygon, per vertex count
+    for vertices in VERTEX_COUNTS:
+        coordinates = regular_polygon(vertices)
+        polygon = Polygon(coordinates)
+        suffix = f"[vertices={vertices}]"
+
+        # Transforms invalidate the cached world coordinates, so read them back to include the rebuild
+        def transform(method, *args, polygon=polygon):
+            def function():
+                method(*args)
+                return polygon.coordinates
+            return function
+
+        yield Benchmark("shapes.polygon.init" + suffix, lambda coordinates=coordinates: Polygon(coordinates))
+        yield Benchmark("shapes.polygon.reorder_coords" + suffix, lambda polygon=polygon, coordinates=coordinates: polygon.reorder_coords(coordinates))
+        yield Benchmark("shapes.polygon.move" + suffix, transform(polygon.move, 0.5, -0.5))
+        yield Benchmark("shapes.polygon.move_to" + suffix, transform(polygon.move_to, (100, 100)))
+        yield Benchmark("shapes.polygon.rotate" + suffix, transform(polygon.rotate, 3))
+        yield Benchmark("shapes.polygon.rotate_about" + suffix, transform(polygon.rotate, 3, (50, 50)))
+        yield Benchmark("shapes.polygon.enlarge" + suffix, transform(polygon.enlarge, 1))
+
+        polygon = Polygon(coordinates)
+        yield Benchmark("shapes.polygon.collidepoint" + suffix, lambda polygon=polygon: polygon.collidepoint((105, 98)))
+        yield Benchmark("shapes.polygon.collidelines" + suffix, lambda polygon=polygon: polygon.collidelines(other.boundaries))
+        yield Benchmark("shapes.polygon.collideline" + suffix, lambda polygon=polygon: polygon.collideline(line.boundary))
+        yield Benchmark("shapes.polygon.collideline_miss" + suffix, lambda polygon=polygon: polygon.collideline(far_line.boundary))
+        yield Benchmark("shapes.polygon.colliderect" + suffix, lambda polygon=polygon: polygon.colliderect(rect))
+        yield Benchmark("shapes.polygon.collidecircle" + suffix, lambda polygon=polygon: polygon.collidecircle(circle))
+        yield Benchmark("shapes.polygon.collidepolygon" + suffix, lambda polygon=polygon: polygon.collidepolygon(other))
+        yield Benchmark("shapes.polygon.collidepolygon_mtv" + suffix, lambda polygon=polygon: polygon.collidepolygon(other, True))
+        yield Benchmark("shapes.polygon.collideline_object" + suffix, lambda polygon=polygon: polygon.collideline_object(line))
+
+    yield Benchmark("shapes.rotate_coord", lambda: rotate_coord([10, 20], 33, (5, 5)))
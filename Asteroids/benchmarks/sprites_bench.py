@@ -0,0 +1,62 @@
+"""
+Scenario benchmarks of the per-tick sprite updates at increasing object counts.
+Every sample starts from a freshly built, seeded state, so destroyed asteroids
+and culled bullets do not change the workload between samples.
+"""
+
+import random
+
+from pygame.locals import K_LEFT, K_RIGHT
+
+from assets import audio
+from assets.sprites import Player, Bullets, Asteroids
+from benchmarks.harness import Benchmark
+
+WIDTH, HEIGHT = 650, 650
+ASTEROID_COUNTS = [4, 16, 64, 256]
+BULLET_COUNTS = [8, 64, 512, 4096]
+
+def field(asteroids: int, bullets: int, seed: int=0):
+    """
+    Build a player, bullets and asteroids spread over the screen.
+    Returns:
+        (player, bullets, asteroids)
+    """
+    rng = random.Random(seed)
+    player = Player(WIDTH, HEIGHT, rng)
+    player.safe, player.timer = True, 10**9  # Keep the player from dying and ending the scenario
+
+    pool = Bullets(WIDTH, HEIGHT)
+    for i in range(bullets):
+        pool.add((rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)), (rng.uniform(-11, 11), rng.uniform(-11, 11)))
+
+    rocks = Asteroids(WIDTH, HEIGHT, random.Random(seed), random.Random(seed))
+    rocks.add([[rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)] for i in range(asteroids)],
+            [[rng.uniform(-2, 2), rng.uniform(-2, 2)] for i in range(asteroids)],
+            [rng.randrange(3) for i in range(asteroids)],
+            [rng.randrange(3) for i in range(asteroids)])
+    return player, pool, rocks
+
+
+def benchmarks():
+    audio.disable()
+
+    def move(state):
+        player, bullets, asteroids = state
+        asteroids.move(player, bullets, 0, False)
+
+    def handle(state):
+        player, bullets, asteroids = state
+        bullets.bullet_handler(player, False)
+
+    for count in ASTEROID_COUNTS:
+        yield Benchmark(f"sprites.asteroids.move[asteroids={count},bullets=0]", move, lambda count=count: field(count, 0))
+        yield Benchmark(f"sprites.asteroids.move[asteroids={count},bullets=16]", move, lambda count=count: field(count, 16))
+
+    for count in BULLET_COUNTS:
+        yield Benchmark(f"sprites.asteroids.move[asteroids=16,bullets={count}]", move, lambda count=count: field(16, count))
+        yield Benchmark(f"sprites.bullets.bullet_handler[bullets={count}]", handle, lambda count=count: field(0, count))
+
+    player = Player(WIDTH, HEIGHT)
+    keys = {K_LEFT: True, K_RIGHT: False}
+    yield Benchmark("sprites.player.move", lambda: player.move(True, keys))
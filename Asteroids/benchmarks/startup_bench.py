@@ -0,0 +1,89 @@
+"""
+Startup benchmark: the time to import the game, create it and draw the first menu frame.
+Every run starts a fresh interpreter, so nothing is already imported or loaded. From the Asteroids directory:
+    python -m benchmarks.startup_bench --runs 10 --budget 500
+Exits with status 1 if the median time to the first menu frame is over the budget.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ["import", "init", "first_frame"]
+
+def child():
+    """Time the startup phases in this interpreter and print them as JSON, in ms since the start"""
+    start = perf_counter()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    import main
+    imported = perf_counter()
+    game = main.Asteroids_Game()
+    created = perf_counter()
+    game.menu.loop(game.WIN)
+    drawn = perf_counter()
+
+    print(json.dumps({"import": (imported - start)*1000, "init": (created - start)*1000, "first_frame": (drawn - start)*1000}))
+
+
+def measure(runs: int):
+    """
+    Start the game in fresh interpreters.
+    Returns:
+        list of dicts of phase -> ms since the interpreter started running the benchmark
+    """
+    samples = []
+    for run in range(runs):
+        output = subprocess.run([sys.executable, "-m", "benchmarks.startup_bench", "--child"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def median(values):
+    ordered = sorted(values)
+    middle = len(ordered)//2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle])/2
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's startup time.")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to start (default: %(default)s)")
+    parser.add_argument("--budget", type=float, default=None, help="largest allowed median time to the first menu frame in ms")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    samples = measure(args.runs)
+    results = {}
+    for phase in PHASES:
+        times = [sample[phase] for sample in samples]
+        results[phase] = {"median": median(times), "min": min(times), "max": max(times)}
+        print(f"{phase:<12} median {results[phase]['median']:>8.1f}ms  min {results[phase]['min']:>8.1f}ms  max {results[phase]['max']:>8.1f}ms")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"runs": args.runs, "results": results, "samples": samples}, file, indent=2)
+
+    if args.budget is not None:
+        first_frame = results["first_frame"]["median"]
+        print(f"first frame {first_frame:.1f}ms, budget {args.budget:.1f}ms: {'OK' if first_frame <= args.budget else 'OVER BUDGET'}")
+        if first_frame > args.budget:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Throughput benchmark of the batched environments in assets/vecenv.py. From the Asteroids directory:
+    python -m benchmarks.vecenv_bench --envs 64 --workers 0 1 2 4
+Reports environment steps per second, in total and per core used.
+"""
+
+import os
+import sys
+import json
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+# Set before pygame is first imported, so neither this process nor the workers print its banner
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from assets.vecenv import VecEnv
+
+def measure(envs: int, workers: int, steps: int, seed: int=0):
+    """
+    Step a VecEnv with random actions.
+    Returns:
+        dict of the run's throughput
+    """
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 16, size=(steps, envs), dtype=np.uint8)
+    with VecEnv(envs, workers, seed) as env:
+        # Workers past the number of games or cores do not add any parallelism
+        cores = min(max(env.workers, 1), os.cpu_count() or 1)
+        env.reset()
+        env.step(actions[0])  # Warm up the workers
+        start = perf_counter()
+        for step in range(steps):
+            env.step(actions[step])
+        seconds = perf_counter() - start
+    total = envs*steps/seconds
+    return {
+        "envs": envs,
+        "workers": workers,
+        "cores": cores,
+        "steps": steps,
+        "seconds": seconds,
+        "steps_per_second": total,
+        "steps_per_second_per_core": total/cores,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the batched Asteroids environments.")
+    parser.add_argument("--envs", type=int, default=64, help="number of games (default: %(default)s)")
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="worker counts to try, 0 runs in-process (default: 0 and powers of 2 up to the core count)")
+    parser.add_argument("--steps", type=int, default=300, help="steps per run (default: %(default)s)")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this path")
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        cores = os.cpu_count() or 1
+        workers = [0] + [2**i for i in range(cores.bit_length()) if 2**i <= cores]
+
+    results = []
+    for count in workers:
+        result = measure(args.envs, count, args.steps)
+        results.append(result)
+        print(f"{count:>3} workers: {result['steps_per_second']:>10.0f} steps/s, {result['steps_per_second_per_core']:>10.0f} steps/s per core ({result['cores']} used)")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,120 +1,181 @@
 import pygame
 import sys
-import random
+import atexit
+import argparse
 from pygame.locals import *
 
 from assets.shapes import *
 from assets.sprites import *
 from assets.scenes import *
-
-pygame.font.init()
+from assets.render import DirtyRenderer
+from assets.hud import HUD, get_atlas
+from assets.timing import FixedTimestep, FrameScheduler
+from assets.simulation import Simulation
+from assets.replay import InputLog
+from assets.profiler import Profiler
+from assets.loader import ASSETS, FONT
+from assets.audio import AUDIO
 
 # Colors
 BLACK = (0, 0, 0)
 
 class Asteroids_Game:
-    def __init__(self):
+    def __init__(self, seed=None, record=None, limiter="low-cpu"):
+        """
+        Creates the game window.
+        Arguments:
+            seed: seed of the game's random streams, a random one is picked if None
+            record: path to save the session's input log to on exit, nothing is recorded if None
+            limiter: frame limiter mode, "low-cpu" or "precise", see FrameScheduler
+        """
         self.WIDTH, self.HEIGHT = 650, 650
         self.WIN = pygame.display.set_mode((self.WIDTH, self.HEIGHT))
         pygame.display.set_caption("Asteroids")
         pygame.mouse.set_visible(False)
-        pygame.display.set_icon(pygame.image.load("assets/images/icon.png"))
+        pygame.display.set_icon(ASSETS.image("assets/images/icon.png"))
 
-        self.clock = pygame.time.Clock()
         self.FPS = 60
+        self.scheduler = FrameScheduler(self.FPS, limiter)  # Ends every frame of every scene
+        self.TICK_RATE = 60  # Simulation steps per second, independent of the frame rate
+        self.timestep = FixedTimestep(self.TICK_RATE)
 
         self.canvas = pygame.Surface((self.WIDTH, self.HEIGHT))
+        self.renderer = DirtyRenderer(self.WIN, self.canvas, BLACK)
+        self.hud = HUD(get_atlas(ASSETS.font(FONT, 30)), ASSETS.image("assets/images/health bar.png", (0, 0, 0)))
 
-        self.player = Player(self.WIDTH, self.HEIGHT)
-        self.bullets = Bullets(self.WIDTH, self.HEIGHT)
-        self.asteroids = Asteroids(self.WIDTH, self.HEIGHT).next_round()
+        self.simulation = Simulation(self.WIDTH, self.HEIGHT, seed)
+        self.shake_rng = self.simulation.streams["shake"]
+        self.profiler = Profiler()  # Overlay toggled with F3
+        self.simulation.profiler = self.profiler
         self.menu = Menu()
         self.game_over = Game_over(self.canvas)
         self.pause = Pause(self.canvas)
 
         self.fire = False
         self.move = False
-        self.score = 0
 
-        self.shake = False
-        self.shake_timer = 0
+        self.log = None
+        self.new_game = False  # Recorded on the next tick, so replays reset at the same point
+        if record:
+            self.log = InputLog(self.simulation.seed, self.TICK_RATE)
+            atexit.register(self.log.save, record)
 
     def reset_game(self):
-        self.player = Player(self.WIDTH, self.HEIGHT)
-        self.bullets = Bullets(self.WIDTH, self.HEIGHT)
-        self.asteroids = Asteroids(self.WIDTH, self.HEIGHT).next_round()
+        self.simulation.reset()
         self.fire = False
-        self.score = 0
-
-    def draw(self):
+        self.new_game = True
+
+    def update(self):
+        """Advance the game by one fixed tick"""
+        keys = pygame.key.get_pressed()
+        left, right = bool(keys[K_LEFT]), bool(keys[K_RIGHT])
+        self.simulation.tick(self.move, self.fire, {K_LEFT: left, K_RIGHT: right})
+        if self.log is not None:
+            self.log.record(self.move, self.fire, left, right, self.new_game)
+        self.new_game = False
+        self.game_over.game_over = self.simulation.game_over
+
+    def draw(self, alpha=1):
+        """
+        Draw the game.
+        Arguments:
+            alpha: fraction of the way from the previous tick to the current one
+        """
+        simulation = self.simulation
         roll = [0, 0]
-        if self.shake:
-            self.shake_timer = 15
-        if self.shake_timer:
-            self.shake_timer -= 1
-            roll = [random.randint(-2, 2), random.randint(-2, 2)]
-
-        self.canvas.fill(BLACK)
-        self.player.draw(self.canvas)
-        self.bullets.draw(self.canvas)
-        self.asteroids.draw(self.canvas)
-
-        text = FONT_2.render(str(self.score), True, (255, 255, 255))
-        self.canvas.blit(text, (78-(text.get_rect().width//2), 10))
-
-        self.WIN.blit(self.canvas, (roll[0], roll[1]))
-        pygame.display.update()
-
-    def main(self):        
+        if simulation.shake_timer:
+            roll = [self.shake_rng.randint(-2, 2), self.shake_rng.randint(-2, 2)]
+
+        self.renderer.clear()
+        rects = simulation.player.draw(self.canvas, alpha)
+        rects += simulation.bullets.draw(self.canvas, alpha)
+        rects += simulation.asteroids.draw(self.canvas, alpha)
+
+        self.hud.update(simulation.score, simulation.player.health)
+        rects.append(self.hud.draw(self.canvas))
+
+        profiler = self.profiler
+        if profiler:
+            rects += profiler.draw(self.canvas, {
+                "asteroids": len(simulation.asteroids.asteroids),
+                "bullets": len(simulation.bullets),
+                "particles": len(simulation.asteroids.particles),
+                "tps": round(self.timestep.ticks_per_second),
+                "fps": round(self.timestep.renders_per_second),
+                "late": self.scheduler.late,
+                "dropped": self.scheduler.dropped,
+            })
+            profiler.lap("draw")
+
+        self.renderer.present(rects, roll)
+        if profiler: profiler.lap("present")
+
+    def main(self, frame_stats=None):
+        """
+        Run the game until it is closed.
+        Arguments:
+            frame_stats: path to write the frame scheduler's counters to as JSON on exit, they are only printed if None
+        """
+        atexit.register(self.scheduler.dump, frame_stats)
+        self.scheduler.reset()
         run = True
         while run:
             if self.menu.menu:
                 self.menu.loop(self.WIN)
-            elif self.game_over.game_over and not self.player.dead:
-                reset = self.game_over.loop(self.WIN, self.score, self.menu)
+                ASSETS.preload()  # Once the first menu frame is up, the mixer and the rest of the assets load behind it
+                self.renderer.invalidate()
+                self.timestep.reset()
+            elif self.game_over.game_over and not self.simulation.player.dead:
+                reset = self.game_over.loop(self.WIN, self.simulation.score, self.menu)
+                self.renderer.invalidate()
+                self.timestep.reset()
                 if reset:
                     self.reset_game()
             else:
-                if not len(self.asteroids.asteroids):
-                    self.asteroids.asteroid_no += 1
-                    if self.asteroids.asteroid_no > 6: 
-                        self.asteroids.asteroid_no = 6
-                    self.asteroids.next_round()
-
+                if self.profiler: self.profiler.begin_frame()
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         pygame.quit()
                         sys.exit()
                     if event.type == pygame.KEYDOWN:
+                        if event.key == K_F3:
+                            self.profiler.toggle()
                         if event.key == pygame.K_UP:
                             self.move = True
                         if event.key == pygame.K_SPACE:
                             self.fire = True
                         if event.key == K_p: 
-                            CLICK_SOUND.play()
-                            reset = self.pause.loop(self.WIN, self.canvas, self.menu, self.clock, self.FPS)
+                            AUDIO.play(self.pause.CLICK_SOUND, "ui")
+                            reset = self.pause.loop(self.WIN, self.canvas, self.menu, self.scheduler)
+                            self.renderer.invalidate()
+                            self.timestep.reset()
                             if reset:
                                 self.reset_game()
                     if event.type == KEYUP:
                         if event.key == K_SPACE: self.fire = False
                         if event.key == K_UP: self.move = False
+                if self.profiler: self.profiler.lap("input")
+
+                # Run however many ticks are due, then draw once. A slow machine drops
+                # rendered frames instead of slowing the game down.
+                for tick in range(self.timestep.advance()):
+                    self.update()
+                    if self.menu.menu or self.simulation.finished:
+                        break
+                self.draw(self.timestep.alpha)
 
-                self.shake = False
-                if self.player.dead: 
-                    health, end = self.player.death()
-                    if end:
-                        self.player = Player(self.WIDTH, self.HEIGHT)
-                        self.player.health = health
-                        self.player.safe = True
-                        self.player.timer = 300
-                else: self.player.move(self.move)
-                self.score, self.shake = self.asteroids.move(self.player, self.bullets.bullets, self.score, self.game_over, self.shake)
-                self.bullets.bullet_handler(self.player, self.fire)
-                self.draw()
-
-            self.clock.tick(self.FPS)
+            self.scheduler.wait()
+            if self.profiler and self.profiler.current:
+                self.profiler.lap("wait")
+                self.profiler.end_frame()
 
     
 
 if __name__ == '__main__':
-    Asteroids_Game().main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Asteroids")
+    parser.add_argument("--seed", type=int, default=None, help="seed for the game's random streams")
+    parser.add_argument("--record", metavar="PATH", default=None, help="save the session's inputs for python -m assets.replay")
+    parser.add_argument("--limiter", choices=FrameScheduler.MODES, default="low-cpu", help="frame limiter, precise spins for the last moments of each frame (default: %(default)s)")
+    parser.add_argument("--frame-stats", metavar="PATH", default=None, help="write the frame time counters printed on exit to this path as JSON")
+    args = parser.parse_args()
+    Asteroids_Game(args.seed, args.record, args.limiter).main(args.frame_stats)
\ No newline at end of file